@@ -0,0 +1,385 @@
+"""
+End-to-end load test: simulated players in many channels against the real cogs,
+session engine, outbox and stats store, with Discord faked out. Fully offline:
+
+    python bench/load_sim.py [--channels 20] [--players 1] [--duration 60] [--length 5]
+                             [--commands gtb,memorize_all,memorize_pl,memorize_random_en,memorize_random_pl]
+                             [--latency 1.5] [--jitter 0.5] [--accuracy 0.85]
+                             [--api-latency 0.05] [--backend json] [--words data/words.json]
+
+Every channel runs one of --commands (round robin over the channels): its first
+player calls the slash command's callback with a fake Interaction, and again
+whenever the session ends. Once a hint's prompt is delivered each of the --players guesses
+after a log-normal delay (median --latency s, sigma --jitter): a word that is
+still missing with probability --accuracy, otherwise a wrong one. Guesses are
+fake messages handed to MyBot through bot.dispatch("message"), the way the
+gateway delivers MESSAGE_CREATE. Fake channels and messages take --api-latency
+seconds per API call. The outbox's real rate limits apply unless --no-rate-limit
+is given.
+
+Without a words file (or with --synthetic-words N) a random vocabulary is generated.
+Stats, telemetry and the compiled word store go to a temp dir.
+
+Reports per-round time (prompt to solved / missed), prompt delay (time a prompt
+sat in the outbox before the fake API saw it), API calls by kind, event-loop
+lag and stats-store writes.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import types
+from collections import Counter, defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = ("gtb", "memorize_all", "memorize_pl", "memorize_random_en", "memorize_random_pl", "review")
+
+# ---------- fake Discord ----------
+
+class FakeMessage:
+    _ids = itertools.count(1)
+    _state = None  # commands.Bot.get_context reads it
+
+    def __init__(self, channel: "FakeChannel", author, content: str):
+        self.id = next(self._ids)
+        self.channel = channel
+        self.author = author
+        self.content = content
+        self.guild = None
+
+    async def edit(self, content: str) -> "FakeMessage":
+        await self.channel.api("edit")
+        self.content = content
+        return self
+
+    async def delete(self) -> None:
+        await self.channel.api("delete")
+
+class FakeChannel:
+    def __init__(self, cid: int, metrics: "Metrics", api_latency: float, bot_user):
+        self.id = cid
+        self.metrics = metrics
+        self.api_latency = api_latency
+        self.bot_user = bot_user
+        self.prompt_up = False  # the current attempt's prompt has been delivered
+
+    async def api(self, kind: str) -> None:
+        self.metrics.api[kind] += 1
+        if self.api_latency:
+            await asyncio.sleep(self.api_latency)
+
+    async def send(self, content: str) -> FakeMessage:
+        prompt = self.metrics.saw_send(self.id)
+        await self.api("send")
+        if prompt:
+            self.prompt_up = True
+        return FakeMessage(self, self.bot_user, content)
+
+class FakeResponse:
+    def __init__(self, channel: FakeChannel):
+        self.channel = channel
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False) -> None:
+        self._done = True
+        await self.channel.api("interaction")
+
+    async def send_message(self, content: str = None, *, ephemeral: bool = False, **kwargs) -> None:
+        self._done = True
+        await self.channel.api("interaction")
+
+class FakeFollowup:
+    def __init__(self, channel: FakeChannel):
+        self.channel = channel
+
+    async def send(self, content: str = None, **kwargs) -> FakeMessage:
+        await self.channel.api("interaction")
+        return FakeMessage(self.channel, self.channel.bot_user, content or "")
+
+class FakeInteraction:
+    def __init__(self, channel: FakeChannel, user):
+        self.channel = channel
+        self.channel_id = channel.id
+        self.user = user
+        self.guild = None
+        self.response = FakeResponse(channel)
+        self.followup = FakeFollowup(channel)
+
+def fake_user(uid: int, bot: bool = False):
+    return types.SimpleNamespace(id=uid, bot=bot, mention=f"<@{uid}>", display_name=f"player{uid}", name=f"player{uid}")
+
+# ---------- measurements ----------
+
+class Metrics:
+    def __init__(self):
+        self.api: Counter = Counter()
+        self.rounds: list = []          # (command, seconds, outcome)
+        self.prompt_delay: list = []
+        self.lag: list = []
+        self.sessions: Counter = Counter()
+        self.guesses = 0
+        self.persist = 0                # stats_store mutations
+        self.snapshots = 0              # full stats file rewrites
+        self._prompt_wait: dict = {}    # channel id -> when its current attempt started
+
+    def attempt_started(self, cid: int, now: float) -> None:
+        self._prompt_wait[cid] = now
+
+    def saw_send(self, cid: int) -> bool:
+        # the first send after an attempt starts is its prompt (PROMPT has top priority)
+        started = self._prompt_wait.pop(cid, None)
+        if started is None:
+            return False
+        self.prompt_delay.append(time.perf_counter() - started)
+        return True
+
+def instrument(metrics: Metrics, live: dict, command_of: dict) -> None:
+    """Wrap the engine and store entry points we measure (looked up by name at call time)."""
+    from core import stats_store
+    from utils import sessions
+
+    attempt = sessions._attempt
+
+    async def timed_attempt(channel, guesses, rnd, prompts, answers):
+        live[channel.id] = answers
+        channel.prompt_up = False
+        start = time.perf_counter()
+        metrics.attempt_started(channel.id, start)
+        try:
+            result = await attempt(channel, guesses, rnd, prompts, answers)
+        finally:
+            if live.get(channel.id) is answers:
+                del live[channel.id]
+        metrics.rounds.append((command_of[channel.id], time.perf_counter() - start, result.outcome))
+        return result
+
+    sessions._attempt = timed_attempt
+
+    persist = stats_store._persist
+
+    async def counted_persist(*args, **kwargs):
+        metrics.persist += 1
+        return await persist(*args, **kwargs)
+
+    stats_store._persist = counted_persist
+
+    write_snapshot = stats_store._write_snapshot
+
+    def counted_write(payload):
+        metrics.snapshots += 1
+        return write_snapshot(payload)
+
+    stats_store._write_snapshot = counted_write
+
+async def watch_loop_lag(metrics: Metrics, until: float, interval: float = 0.02) -> None:
+    loop = asyncio.get_running_loop()
+    while loop.time() < until:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        metrics.lag.append(max(0.0, loop.time() - expected))
+
+# ---------- players ----------
+
+WRONG = "qqqqq"
+
+def missing_answers(answers) -> list:
+    """What the oracle player could still type for this attempt."""
+    from core.game import GtbWord
+    if isinstance(answers, GtbWord):
+        return [answers.entry["english"]]
+    return sorted(answers.needed - answers.guessed)
+
+async def start_command(bot, name: str, channel: FakeChannel, user, length: int, metrics: Metrics) -> None:
+    from config import guild
+    cmd = bot.tree.get_command(name, guild=guild)
+    kwargs = {"difficulty": "normal"} if name == "gtb" else {"lang": "en", "length": length} if name == "review" \
+        else {"length": length}
+    metrics.sessions[name] += 1
+    await cmd.callback(cmd.binding, FakeInteraction(channel, user), **kwargs)
+
+async def player(bot, name: str, channel: FakeChannel, user, live: dict, args, metrics: Metrics,
+                 rng: random.Random, until: float, starts: bool) -> None:
+    """One player; the channel's first player (`starts`) also (re)starts the command."""
+    from utils.sessions import get_session
+    loop = asyncio.get_running_loop()
+    mu = math.log(args.latency)
+    while loop.time() < until:
+        if get_session(channel.id) is None and not starts:
+            await asyncio.sleep(0.05)
+            continue
+        if get_session(channel.id) is None:
+            await start_command(bot, name, channel, user, args.length, metrics)
+            await asyncio.sleep(0)
+            if get_session(channel.id) is None:
+                return  # the command refused (e.g. no words of that length)
+            continue
+        answers = live.get(channel.id)
+        if answers is None or answers.done() or not channel.prompt_up:
+            await asyncio.sleep(0.05)
+            continue
+        await asyncio.sleep(min(rng.lognormvariate(mu, args.jitter), max(0.0, until - loop.time())))
+        if live.get(channel.id) is not answers or answers.done():
+            continue
+        todo = missing_answers(answers)
+        word = rng.choice(todo) if todo and rng.random() < args.accuracy else WRONG
+        metrics.guesses += 1
+        bot.dispatch("message", FakeMessage(channel, user, word))
+
+# ---------- setup ----------
+
+def synthetic_words(path: str, count: int, seed: int) -> None:
+    """Random words.json: English themes of 3-10 letters, each with a Polish translation."""
+    rng = random.Random(seed)
+    pl_letters = string.ascii_lowercase + "ąćęłńóśźż"
+    seen = set()
+    entries = []
+    while len(entries) < count:
+        n = rng.randint(3, 10)
+        theme = "".join(rng.choice(string.ascii_lowercase) for _ in range(n))
+        if theme in seen:
+            continue
+        seen.add(theme)
+        pl = "".join(rng.choice(pl_letters) for _ in range(rng.randint(3, 10)))
+        entries.append({"theme": theme, "translations": {"pl": {"translation": pl}}})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False)
+
+def configure_env(args, tmp: str) -> None:
+    """Everything the bot reads at import time; must run before importing it."""
+    words = args.words or os.getenv("WORDS_JSON") or os.path.join(ROOT, "data", "words.json")
+    if args.synthetic_words or not os.path.exists(words):
+        words = os.path.join(tmp, "words.json")
+        synthetic_words(words, args.synthetic_words or 3000, args.seed)
+    os.environ.update({
+        "WORDS_JSON": words,
+        "WORDS_BIN": os.path.join(tmp, "words.bin"),
+        "STATS_BACKEND": args.backend,
+        "STATS_FILE": os.path.join(tmp, "stats.json"),
+        "STATS_DB": os.path.join(tmp, "stats.sqlite3"),
+        "TELEMETRY_FILE": os.path.join(tmp, "telemetry.bin"),
+        "COMMAND_SYNC_FILE": os.path.join(tmp, "command_sync.json"),
+        "DISCORD_TOKEN": os.getenv("DISCORD_TOKEN") or "offline",
+    })
+    if args.no_rate_limit:
+        for knob in ("OUTBOX_CHANNEL_RATE", "OUTBOX_CHANNEL_BURST", "OUTBOX_GLOBAL_RATE", "OUTBOX_GLOBAL_BURST"):
+            os.environ[knob] = "1000000"
+
+async def run(args) -> Metrics:
+    sys.path.insert(0, ROOT)
+    import bot as bot_module
+    from utils import sessions, startup
+
+    metrics = Metrics()
+    t0 = time.perf_counter()
+    await startup.load_data()
+    print(f"data loaded in {time.perf_counter() - t0:.2f}s")
+    if args.retry_delay is not None:
+        sessions.RETRY_DELAY = args.retry_delay
+
+    # entering the client binds it to this loop (bot.dispatch needs that) without logging in;
+    # leaving it runs MyBot.close, which flushes the stats store like a real shutdown
+    async with bot_module.MyBot() as bot:
+        bot_user = fake_user(1, bot=True)
+        bot._connection.user = bot_user  # get_context compares message authors with it
+        for ext in ("cogs.gtb", "cogs.memorize_all_en", "cogs.memorize_all_pl", "cogs.memorize_random_en",
+                    "cogs.memorize_random_pl", "cogs.stats", "cogs.review", "cogs.sessions"):
+            await bot.load_extension(ext)
+
+        live: dict = {}
+        command_of: dict = {}
+        instrument(metrics, live, command_of)
+
+        loop = asyncio.get_running_loop()
+        until = loop.time() + args.duration
+        rng = random.Random(args.seed)
+        players = []
+        for i in range(args.channels):
+            name = args.commands[i % len(args.commands)]
+            channel = FakeChannel(1000 + i, metrics, args.api_latency, bot_user)
+            command_of[channel.id] = name
+            for k in range(args.players):
+                user = fake_user(10_000 + i * args.players + k)
+                players.append(player(bot, name, channel, user, live, args, metrics,
+                                      random.Random(rng.random()), until, starts=k == 0))
+        lag = asyncio.create_task(watch_loop_lag(metrics, until))
+        await asyncio.gather(*players)
+        for session in list(sessions.list_sessions()):
+            await sessions.stop_session(session.channel_id)
+        await lag
+    return metrics
+
+# ---------- report ----------
+
+def _pct(values: list, p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(len(ordered) * p / 100) - 1))]
+
+def _dist(values: list, scale: float = 1.0, unit: str = "s") -> str:
+    if not values:
+        return "-"
+    return (f"p50 {_pct(values, 50) * scale:.3f}{unit}  p90 {_pct(values, 90) * scale:.3f}{unit}  "
+            f"p99 {_pct(values, 99) * scale:.3f}{unit}  max {max(values) * scale:.3f}{unit}")
+
+def report(metrics: Metrics, args) -> None:
+    from core.game import SOLVED
+    minutes = args.duration / 60
+    print(f"{args.channels} channels x {args.players} player(s) x {args.duration:.0f}s, guess latency ~{args.latency}s, "
+          f"accuracy {args.accuracy:.0%}, api latency {args.api_latency * 1000:.0f}ms")
+    print(f"sessions started: {dict(metrics.sessions)}")
+    by_cmd = defaultdict(list)
+    for name, secs, outcome in metrics.rounds:
+        by_cmd[name].append((secs, outcome))
+    for name in args.commands:
+        rows = by_cmd.get(name, [])
+        solved = sum(1 for _, o in rows if o == SOLVED)
+        print(f"  {name:<20} {len(rows):>5} rounds  {solved / len(rows) if rows else 0:>5.0%} solved  "
+              f"{len(rows) / minutes:>7.1f} rounds/min  round {_dist([s for s, _ in rows])}")
+    print(f"prompt delay   {_dist(metrics.prompt_delay, 1000, 'ms')}")
+    print(f"event-loop lag {_dist(metrics.lag, 1000, 'ms')}")
+    calls = sum(metrics.api.values())
+    print(f"guesses sent: {metrics.guesses}  api calls: {calls} ({calls / minutes:.0f}/min) {dict(metrics.api)}")
+    print(f"stats writes: {metrics.persist} mutations, {metrics.snapshots} snapshot rewrites ({args.backend})")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--channels", type=int, default=20)
+    ap.add_argument("--players", type=int, default=1, help="players guessing in each channel")
+    ap.add_argument("--duration", type=float, default=60.0, help="seconds of simulated play")
+    ap.add_argument("--commands", default=",".join(COMMANDS[:5]),
+                    help=f"comma separated, from {', '.join(COMMANDS)}")
+    ap.add_argument("--length", type=int, default=5, help="word length for the memorize commands")
+    ap.add_argument("--latency", type=float, default=1.5, help="median seconds between a player's guesses")
+    ap.add_argument("--jitter", type=float, default=0.5, help="log-normal sigma of the guess latency")
+    ap.add_argument("--accuracy", type=float, default=0.85, help="chance a guess is a missing answer")
+    ap.add_argument("--api-latency", type=float, default=0.05, help="seconds per fake Discord API call")
+    ap.add_argument("--retry-delay", type=float, default=None, help="override the engine's retry pause")
+    ap.add_argument("--no-rate-limit", action="store_true", help="lift the outbox token buckets")
+    ap.add_argument("--backend", default="json", choices=("json", "sqlite", "journal"))
+    ap.add_argument("--words", default=None, help="words.json to use (default: WORDS_JSON / data/words.json)")
+    ap.add_argument("--synthetic-words", type=int, default=0, help="generate this many random words instead")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+    args.commands = [c.strip() for c in args.commands.split(",") if c.strip()]
+    unknown = set(args.commands) - set(COMMANDS)
+    if unknown:
+        ap.error(f"unknown command(s): {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_env(args, tmp)
+        metrics = asyncio.run(run(args))
+    report(metrics, args)
+
+if __name__ == "__main__":
+    main()
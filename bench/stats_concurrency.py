@@ -0,0 +1,85 @@
+"""
+Throughput of core.stats_store under many concurrent memorize sessions.
+
+Runs the same workload with one global lock (STATS_LOCK_STRIPES=1, the old
+behaviour) and with per-user lock stripes, each in a fresh interpreter so the
+store's module-level config is re-read:
+
+    python bench/stats_concurrency.py [--sessions 100] [--rounds 5] [--users 500]
+
+Each simulated session starts a run, then for every round bumps a repetition
+and advances the run, like a correct hint does in the memorize cogs.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+async def _session(store, user_id: int, rounds: int, lang: str, length: int):
+    await store.start_run_if_at_beginning(user_id, lang, length, 0, 0, True)
+    for r in range(rounds):
+        pos, li = divmod(r, 26)
+        await store.bump_repetition(user_id, lang, length, pos, li, "bench")
+        await store.advance_run_on_success(user_id, lang, length, pos, li, "bench", 26, length)
+
+async def _worker(sessions: int, rounds: int) -> dict:
+    sys.path.insert(0, ROOT)
+    from core import stats_store as store
+    store.load()
+    t0 = time.perf_counter()
+    await asyncio.gather(*(
+        _session(store, 10_000_000 + i, rounds, "en", 5) for i in range(sessions)
+    ))
+    await store.close()
+    elapsed = time.perf_counter() - t0
+    ops = sessions * (1 + 2 * rounds)
+    return {"elapsed": elapsed, "ops": ops}
+
+def _seed(path: str, users: int):
+    """Pre-existing users make every full-file write cost what it would in production."""
+    leaf = {"run_started": False, "run_len": 0, "record": 12, "record_updated_at": "",
+            "record_last_pos": 0, "record_last_li": 11, "count_record": False,
+            "repetitions": {f"0-{i}": 3 for i in range(12)}}
+    data = {str(u): {"en": {"5": leaf}, "pl": {"6": leaf}} for u in range(users)}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+def _run(label: str, env_extra: dict, args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        stats = os.path.join(tmp, "stats.json")
+        _seed(stats, args.users)
+        env = dict(os.environ, STATS_FILE=stats, STATS_BACKEND="json", **env_extra)
+        out = subprocess.run(
+            [sys.executable, __file__, "--worker", "--sessions", str(args.sessions), "--rounds", str(args.rounds)],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+    res = json.loads(out.strip().splitlines()[-1])
+    print(f"{label:<44} {res['ops'] / res['elapsed']:>10.0f} ops/s  ({res['elapsed']:.2f}s for {res['ops']} ops)")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=100)
+    ap.add_argument("--rounds", type=int, default=5)
+    ap.add_argument("--users", type=int, default=500)
+    ap.add_argument("--worker", action="store_true")
+    args = ap.parse_args()
+
+    if args.worker:
+        print(json.dumps(asyncio.run(_worker(args.sessions, args.rounds))))
+        return
+
+    print(f"{args.sessions} concurrent sessions x {args.rounds} rounds, {args.users} stored users")
+    for flush in ("0", "5"):
+        mode = "write-through" if flush == "0" else "write-behind"
+        _run(f"[{mode}] global lock (1 stripe)", {"STATS_FLUSH_INTERVAL": flush, "STATS_LOCK_STRIPES": "1"}, args)
+        _run(f"[{mode}] per-user lock stripes (64)", {"STATS_FLUSH_INTERVAL": flush, "STATS_LOCK_STRIPES": "64"}, args)
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,72 @@
+import time
+_T0 = time.perf_counter()
+
+import asyncio
 import discord
+from discord import app_commands
 from discord.ext import commands
 from config import intents, guild, DISCORD_TOKEN, GUILD_ID, OWNER_ID
+from utils import guess_router, command_sync, startup
+from core import stats_store, telemetry
+from core.game import STOP_WORD
+from utils.sessions import stop_session
+
+startup.mark("imports", _T0)
+
+class ReadyTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Commands never see half-loaded word lists / stats
+        if await startup.wait_ready(startup.READY_WAIT):
+            return True
+        text = ("❌ Word lists or stats failed to load; check the bot's console." if startup.error
+                else "⏳ Still loading word lists, try again in a few seconds.")
+        await interaction.response.send_message(text, ephemeral=True)
+        return False
 
 class MyBot(commands.Bot):
     def __init__(self):
-        super().__init__(command_prefix="/", intents=intents)
+        super().__init__(command_prefix="/", intents=intents, tree_cls=ReadyTree)
+        self._data_task: asyncio.Task | None = None
+
+    async def start(self, token: str, *, reconnect: bool = True):
+        # Words and stats load in worker threads while we log in, load cogs and connect
+        self._data_task = asyncio.create_task(startup.load_data())
+        await super().start(token, reconnect=reconnect)
 
     async def setup_hook(self):
         # Load your cogs
-        await self.load_extension("cogs.gtb")
-        await self.load_extension("cogs.memorize_all_en")
-        await self.load_extension("cogs.memorize_all_pl")
-        await self.load_extension("cogs.memorize_random_en")
-        await self.load_extension("cogs.memorize_random_pl")
-        await self.load_extension("cogs.stats")
-        # Fast guild-only sync
-        await self.tree.sync(guild=guild)
-        print(f"✅ Slash commands synced to guild {GUILD_ID}")
+        with startup.timed("cogs"):
+            await self.load_extension("cogs.gtb")
+            await self.load_extension("cogs.memorize_all_en")
+            await self.load_extension("cogs.memorize_all_pl")
+            await self.load_extension("cogs.memorize_random_en")
+            await self.load_extension("cogs.memorize_random_pl")
+            await self.load_extension("cogs.stats")
+            await self.load_extension("cogs.review")
+            await self.load_extension("cogs.sessions")
+        # Fast guild-only sync, skipped when the commands haven't changed since the last one
+        with startup.timed("sync"):
+            digest = command_sync.fingerprint(self.tree, guild)
+            if command_sync.needs_sync(self.application_id, guild, digest):
+                await self.tree.sync(guild=guild)
+                command_sync.mark_synced(self.application_id, guild, digest)
+                print(f"✅ Slash commands synced to guild {GUILD_ID}")
+            else:
+                print(f"✅ Slash commands unchanged for guild {GUILD_ID}; sync skipped (FORCE_COMMAND_SYNC=1 to force)")
+        asyncio.create_task(self._report_startup())
+
+    async def _report_startup(self):
+        await startup.wait_ready()
+        if startup.error is None:
+            print(startup.report(_T0))
+
+    async def close(self):
+        # Flush write-behind stats before the loop goes away (never mid-load)
+        if self._data_task is not None and not self._data_task.done():
+            await self._data_task
+        await stats_store.close()
+        await telemetry.save()
+        await super().close()
 
     async def on_ready(self):
         print(f"✅ Logged in as {self.user} (ID: {self.user.id})")
@@ -27,13 +77,25 @@ class MyBot(commands.Bot):
         if message.author.bot:
             return
 
+        content = message.content.strip().lower()
+
         # Simple shutdown control (optional)
-        if message.content.strip().lower() == "shutdownbot":
+        if content == "shutdownbot":
             if OWNER_ID and message.author.id != OWNER_ID:
                 await message.channel.send("❌ You are not authorized to shut down the bot.")
                 return
             await message.channel.send("⏹️ Shutting down the bot…")
             await self.close()
+            return
+
+        # Stopping doesn't wait for the session to notice: its task is cancelled right here
+        if content == STOP_WORD:
+            if await stop_session(message.channel.id):
+                await message.channel.send("⏹️ Session ended early.")
+            return
+
+        # Guesses go straight to the session running in this channel (if any)
+        guess_router.dispatch(message, content)
 
 def main():
     bot = MyBot()
@@ -0,0 +1,46 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from config import guild
+from core.hint_atlas import get_cells
+from core.game import Mode, EnWords, PlWords, ReviewScoring, NEXT, review_rounds, STOP_WORD
+from utils.sessions import start_session
+
+class ReviewCog(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(
+        name="review",
+        description="Spaced repetition: practise the hints you're due to forget, most overdue first."
+    )
+    @app_commands.describe(lang="en | pl", length="Length of the words to review")
+    async def review(self, interaction: discord.Interaction, lang: str, length: int):
+        lang = lang.lower()
+        if lang not in ("en", "pl"):
+            await interaction.response.send_message("❌ Language must be `en` or `pl`.", ephemeral=True)
+            return
+
+        await interaction.response.defer()
+        channel = interaction.channel
+
+        if not get_cells(lang, length):
+            name = "English" if lang == "en" else "Polish"
+            await channel.send(f"❌ No {name} words of length {length} found.")
+            return
+
+        await start_session(channel, Mode(
+            "review",
+            rounds=review_rounds(lang, length, interaction.user.id),
+            answers=EnWords if lang == "en" else PlWords,
+            scoring=ReviewScoring(interaction.user.id, lang, length),
+            on_miss=NEXT,
+            intro=f"📅 Reviewing **{lang.upper()}** length **{length}** for {interaction.user.mention}. "
+                  f"Type `{STOP_WORD}` to stop.",
+            solved_text="🎉 All words for this hint guessed!",
+            done_text="✅ Nothing else is due for review right now.",
+        ), interaction.user.id)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(ReviewCog(bot), guild=guild)
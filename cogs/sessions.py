@@ -0,0 +1,43 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from config import guild
+from utils.sessions import list_sessions, stop_session
+from core.hint_utils import display_hint
+from utils import outbox
+
+class SessionsCog(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(name="stop", description="Stop the game or memorize session running in this channel")
+    async def stop(self, interaction: discord.Interaction):
+        if await stop_session(interaction.channel_id):
+            await interaction.response.send_message("⏹️ Session ended.")
+        else:
+            await interaction.response.send_message("ℹ️ No session is running in this channel.", ephemeral=True)
+
+    @app_commands.command(name="sessions", description="List running game and memorize sessions")
+    async def sessions(self, interaction: discord.Interaction):
+        running = list_sessions()
+        queued = f"📮 {outbox.depth()} outbound message(s) queued."
+        if not running:
+            await interaction.response.send_message(f"💤 No sessions running. {queued}", ephemeral=True)
+            return
+        lines = []
+        for s in running:
+            hint = f" — hint `{display_hint(s.hint)}`" if s.hint else ""
+            backlog = outbox.depth(s.channel_id)
+            hint += f" ({backlog} queued)" if backlog else ""
+            lines.append(
+                f"• <#{s.channel_id}> **{s.mode}** by <@{s.owner_id}>, "
+                f"started <t:{int(s.started_at.timestamp())}:R>{hint}"
+            )
+        await interaction.response.send_message(
+            f"🎮 {len(running)} session(s) running:\n" + "\n".join(lines) + f"\n{queued}",
+            allowed_mentions=discord.AllowedMentions.none(),
+        )
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(SessionsCog(bot), guild=guild)
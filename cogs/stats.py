@@ -1,11 +1,17 @@
 import discord
+from collections import OrderedDict
 from discord import app_commands
 from discord.ext import commands
 from typing import Optional
-from utils.stats_store import get_stats
-from utils.word_loader import POLISH_ALPHABET
+from core.stats_store import get_stats, get_stats_version, get_leaderboard
+from core.word_loader import POLISH_ALPHABET
+from core import telemetry
 from config import guild
 
+# (user_id, stats version) -> rendered /stats message; a new version simply misses
+RENDER_CACHE_SIZE = 512
+_render_cache: "OrderedDict[tuple, str]" = OrderedDict()
+
 def en_letter(li: int) -> str:
     return chr(ord('a') + li) if 0 <= li < 26 else '?'
 
@@ -30,21 +36,26 @@ def human_reps(entry: dict, lang: str, max_items: int = 6) -> str:
     if not reps:
         return "–"
     items = []
-    for key, count in reps.items():
-        try:
-            p_str, li_str = key.split("-", 1)
-            p = int(p_str) + 1  # human 1-indexed position
-            li = int(li_str)
-        except Exception:
-            continue
+    for pos, li, count in reps:
         L = en_letter(li) if lang == "en" else pl_letter(li)
-        items.append((count, p, L))
+        items.append((count, pos + 1, L))  # human 1-indexed position
     # sort by count desc, then pos asc, then letter asc
     items.sort(key=lambda t: (-t[0], t[1], t[2]))
     shown = [f"pos {p}, '{L}' → {c}x" for c, p, L in items[:max_items]]
     extra = len(items) - max_items
     return "; ".join(shown) + (f"; +{extra} more" if extra > 0 else "")
 
+def secs(ms: Optional[int]) -> str:
+    return "–" if ms is None else f"{ms / 1000:.1f}s"
+
+def human_detail(s: dict) -> str:
+    return (
+        f"{s['rounds']} round(s), {s['solved']} solved, {s['timeouts']} timed out\n"
+        f"  • first guess: p50 {secs(s['first_p50'])}, p90 {secs(s['first_p90'])}\n"
+        f"  • complete: p50 {secs(s['done_p50'])}, p90 {secs(s['done_p90'])}\n"
+        f"  • wrong guesses: {s['wrong_per_round']:.1f} per round"
+    )
+
 class StatsCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
@@ -53,12 +64,34 @@ class StatsCog(commands.Cog):
         name="stats",
         description="Show memorize progress: best record endpoint and per-letter repetitions."
     )
-    @app_commands.describe(user="Optional user to query (defaults to you)")
-    async def stats(self, interaction: discord.Interaction, user: Optional[discord.User] = None):
+    @app_commands.describe(
+        user="Optional user to query (defaults to you)",
+        detail="Show solve-time percentiles and accuracy from recent rounds instead"
+    )
+    async def stats(self, interaction: discord.Interaction, user: Optional[discord.User] = None,
+                    detail: bool = False):
         await interaction.response.defer(ephemeral=False)
         target = user or interaction.user
-        data = await get_stats(target.id)
 
+        if detail:
+            lines = [f"⏱️ Recent rounds for {target.mention}:"]
+            for lang, length in telemetry.user_lengths(target.id):
+                title = "English" if lang == "en" else "Polish"
+                summary = telemetry.summary(telemetry.user_ring(target.id, lang, length))
+                lines.append(f"**{title}** — {length} letters: {human_detail(summary)}")
+            if len(lines) == 1:
+                lines = [f"⏱️ No recorded rounds yet for {target.mention}."]
+            await interaction.followup.send("\n".join(lines))
+            return
+
+        key = (target.id, get_stats_version(target.id))
+        cached = _render_cache.get(key)
+        if cached is not None:
+            _render_cache.move_to_end(key)
+            await interaction.followup.send(cached)
+            return
+
+        data = await get_stats(target.id)
         if not data:
             await interaction.followup.send(f"📊 No stats yet for {target.mention}.")
             return
@@ -82,7 +115,34 @@ class StatsCog(commands.Cog):
             render_lang("en", "English"),
             render_lang("pl", "Polish"),
         ])
-        await interaction.followup.send(f"📊 Progress for {target.mention}:\n{msg}")
+        text = f"📊 Progress for {target.mention}:\n{msg}"
+        _render_cache[key] = text
+        if len(_render_cache) > RENDER_CACHE_SIZE:
+            _render_cache.popitem(last=False)
+        await interaction.followup.send(text)
+
+    @app_commands.command(
+        name="leaderboard",
+        description="Best memorize records for a language and word length."
+    )
+    @app_commands.describe(lang="en | pl", length="Word length")
+    async def leaderboard(self, interaction: discord.Interaction, lang: str, length: int):
+        lang = lang.lower()
+        if lang not in ("en", "pl"):
+            await interaction.response.send_message("❌ Invalid language! Choose en or pl.", ephemeral=True)
+            return
+        await interaction.response.defer(ephemeral=False)
+        board = await get_leaderboard(lang, length)
+        title = "English" if lang == "en" else "Polish"
+        if not board:
+            await interaction.followup.send(f"🏆 No records yet for {title} {length}-letter words.")
+            return
+        medals = ["🥇", "🥈", "🥉"]
+        lines = [f"🏆 **{title} — {length} letters**"]
+        for i, row in enumerate(board):
+            place = medals[i] if i < len(medals) else f"{i+1}."
+            lines.append(f"{place} <@{row['user_id']}> — streak {row['record']} (updated {row['updated_at']})")
+        await interaction.followup.send("\n".join(lines), allowed_mentions=discord.AllowedMentions.none())
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(StatsCog(bot), guild=guild)
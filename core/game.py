@@ -0,0 +1,375 @@
+from __future__ import annotations
+import random
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from core import hint_atlas, telemetry, timeouts
+from core.hint_atlas import ALPHABETS, CellCycle, HintCell, get_cells, get_sampler, pl_tag, resolve
+from core.hint_utils import display_hint, get_hint, get_possible_matches
+from core.word_loader import Words
+from core.stats_store import (
+    bump_repetition, mark_completed,
+    start_run_if_at_beginning, advance_run_on_success, end_run,
+    peek_review, record_review
+)
+
+# ---------- game rules ----------
+# Every game mode is the same loop: take the next hint from a generator, collect
+# guesses until it's solved or time runs out, report progress, update stats,
+# then either move on, retry or end. A Mode plugs in the three parts that differ:
+#   rounds  - hint generator (walk the atlas, random cells, GTB words)
+#   answers - resolver that turns guesses into progress for one round
+#   scoring - what gets written to stats_store on start / solve / miss
+# Everything here is front-end agnostic; utils.sessions runs the loop on Discord.
+
+STOP_WORD = "endmemorize"
+
+SOLVED, MISSED = "solved", "missed"
+# what a Mode does after a missed hint
+RETRY, NEXT, END = "retry", "next", "end"
+
+class Guess(NamedTuple):
+    content: str  # stripped + lowercased once, by the front-end
+    author: str   # how to address the guesser (a mention on Discord)
+
+class Round:
+    """
+    One hint. `prompts` are successive stages (GTB reveals another letter per
+    stage); each stage gets `timeout` seconds. `footer` is sent once the round
+    is over, solved or not. Rounds with a `lang` are hint cells (pos, li) and get
+    telemetry recorded.
+    """
+    __slots__ = ("raw_hint", "prompts", "timeout", "target", "pos", "li", "footer", "lang")
+
+    def __init__(self, raw_hint: str, prompts: List[str], timeout: float, target,
+                 pos: int = -1, li: int = -1, footer: Optional[str] = None, lang: Optional[str] = None):
+        self.raw_hint = raw_hint
+        self.prompts = prompts
+        self.timeout = timeout
+        self.target = target  # HintCell, or a GtbTarget
+        self.pos = pos
+        self.li = li
+        self.footer = footer
+        self.lang = lang
+
+class Attempt:
+    """How one attempt at a round went; handed to the scoring policy."""
+    __slots__ = ("outcome", "elapsed", "limit", "solved", "total", "first_guess", "wrong")
+
+    def __init__(self):
+        self.outcome = MISSED
+        self.elapsed = 0.0  # seconds from the first prompt to solving (or giving up)
+        self.limit = 0.0    # seconds that were allowed over all stages
+        self.solved = 0
+        self.total = 0
+        self.first_guess: Optional[float] = None  # seconds from the first prompt to the first guess
+        self.wrong = 0      # guesses that credited nothing
+
+# ---------- answer resolvers ----------
+
+class Answers(ABC):
+    """Progress on one attempt at a round; a fresh one is made for every retry."""
+    total = 1
+    solved = 0
+
+    @abstractmethod
+    def credit(self, guess: Guess) -> Optional[str]:
+        """Announcement for a guess that made progress, else None."""
+
+    def done(self) -> bool:
+        return self.solved >= self.total
+
+    @abstractmethod
+    def miss_text(self) -> str:
+        """What the channel is told when time runs out."""
+
+class EnWords(Answers):
+    """English hint cell: every matching English word, at most one credited per message."""
+    def __init__(self, cell: HintCell):
+        self.cell = cell
+        self.needed = set(cell["matches"])
+        self.guessed = set()
+        self.total = len(self.needed)
+
+    @property
+    def solved(self) -> int:
+        return len(self.guessed)
+
+    def credit(self, guess: Guess) -> Optional[str]:
+        entries = self.cell["words"].lists["normal"]
+        hits = [entries[i]["english"] for i in resolve("en", self.cell, guess.content)]
+        eng = next((h for h in hits if h not in self.guessed), None)
+        if eng is None:
+            return None
+        self.guessed.add(eng)
+        return f"✅ `{eng}` guessed!"
+
+    def miss_text(self) -> str:
+        missed = sorted(self.needed - self.guessed)
+        return "❌ Time's up or some words were missed!\nMissed: " + ", ".join(f"`{m}`" for m in missed)
+
+class PlWords(Answers):
+    """Polish hint cell: progress counts base Polish words, not meanings."""
+    def __init__(self, cell: HintCell):
+        self.cell = cell
+        self.needed = set(cell["matches"])
+        self.guessed = set()
+        self.guessed_tags = set()
+        self.total = len(self.needed)
+
+    @property
+    def solved(self) -> int:
+        return len(self.guessed)
+
+    def credit(self, guess: Guess) -> Optional[str]:
+        entries = self.cell["words"].polish
+        hits = {}
+        for i in resolve("pl", self.cell, guess.content):
+            tag = pl_tag(entries[i])
+            if tag not in self.guessed_tags:
+                hits[tag] = entries[i]["polish"]
+        if not hits:
+            return None
+        self.guessed_tags.update(hits)
+        # credit at most one new base per message
+        base = next((b for b in hits.values() if b not in self.guessed), None)
+        if base is not None:
+            self.guessed.add(base)
+        return f"✅ `{guess.content}` guessed! ({', '.join(sorted(hits))})"
+
+    def miss_text(self) -> str:
+        missed = sorted(self.needed - self.guessed)
+        return "❌ Time's up or some words were missed!\nMissed base words:\n" + ", ".join(missed)
+
+class GtbTarget(NamedTuple):
+    entry: dict         # EnEntry
+    words: Words        # the load of words.json its id points into
+
+class GtbWord(Answers):
+    """Guess The Build: the first correct answer from anyone solves it."""
+    def __init__(self, target: GtbTarget):
+        self.entry, self.words = target
+
+    def credit(self, guess: Guess) -> Optional[str]:
+        if self.entry["id"] not in self.words.en_answer_index.get(guess.content, ()):
+            return None
+        self.solved = 1
+        return f"✅ {guess.author} guessed the word **{self.entry['english']}** 🎉"
+
+    def miss_text(self) -> str:
+        return f"❌ No one guessed the word. It was **{self.entry['english']}**"
+
+# ---------- scoring policies ----------
+
+class Scoring:
+    """No stats (GTB, random EN)."""
+    async def start(self) -> None:
+        pass
+
+    async def solved(self, rnd: Round, attempt: Attempt) -> None:
+        pass
+
+    async def missed(self, rnd: Round, attempt: Attempt) -> None:
+        pass
+
+class RepScoring(Scoring):
+    """Count a repetition per solved hint; a miss closes any open run."""
+    def __init__(self, user_id: int, lang: str, length: int):
+        self.user_id = user_id
+        self.lang = lang
+        self.length = length
+
+    async def solved(self, rnd: Round, attempt: Attempt) -> None:
+        iso = datetime.now(timezone.utc).isoformat()
+        await bump_repetition(self.user_id, self.lang, self.length, rnd.pos, rnd.li, iso)
+        await mark_completed(self.user_id, self.lang, self.length, rnd.pos, rnd.li, iso)
+
+    async def missed(self, rnd: Round, attempt: Attempt) -> None:
+        await end_run(self.user_id, self.lang, self.length)
+
+class RunScoring(RepScoring):
+    """Repetitions plus the contiguous run that feeds the per-length record."""
+    def __init__(self, user_id: int, lang: str, length: int, start_pos: int, start_li: int, record_eligible: bool):
+        super().__init__(user_id, lang, length)
+        self.start_pos = start_pos
+        self.start_li = start_li
+        self.record_eligible = record_eligible
+
+    async def start(self) -> None:
+        # Reset any existing run for this user/length before starting a new one
+        await end_run(self.user_id, self.lang, self.length)
+        await start_run_if_at_beginning(
+            self.user_id, self.lang, self.length, self.start_pos, self.start_li, self.record_eligible
+        )
+
+    async def solved(self, rnd: Round, attempt: Attempt) -> None:
+        await super().solved(rnd, attempt)
+        iso = datetime.now(timezone.utc).isoformat()
+        await advance_run_on_success(
+            self.user_id, self.lang, self.length, rnd.pos, rnd.li, iso, len(ALPHABETS[self.lang]), self.length
+        )
+
+class ReviewScoring(RepScoring):
+    """
+    /review: every attempt feeds the cell's SM-2 schedule. A solve is graded
+    by how much of the time it took (5 / 4 / 3); a miss by how much was found (2 / 1).
+    """
+    async def solved(self, rnd: Round, attempt: Attempt) -> None:
+        await super().solved(rnd, attempt)
+        share = attempt.elapsed / attempt.limit if attempt.limit else 1.0
+        quality = 5 if share <= 1 / 3 else 4 if share <= 2 / 3 else 3
+        await record_review(self.user_id, self.lang, self.length, rnd.pos, rnd.li, quality)
+
+    async def missed(self, rnd: Round, attempt: Attempt) -> None:
+        quality = 2 if attempt.total and attempt.solved * 2 >= attempt.total else 1
+        await record_review(self.user_id, self.lang, self.length, rnd.pos, rnd.li, quality)
+
+# ---------- hint generators ----------
+
+def parse_start_hint(start_hint: Optional[str], length: int, lang: str) -> Tuple[int, int]:
+    """(pos, letter index) of the first revealed letter in e.g. '__m______', else (0, 0)."""
+    if start_hint and len(start_hint) == length:
+        alphabet = ALPHABETS[lang]
+        for i, ch in enumerate(start_hint):
+            if ch not in {'_', ' '}:
+                return i, alphabet.index(ch.lower()) if ch.lower() in alphabet else 0
+    return 0, 0
+
+def hint_cells(lang: str, length: int, start_pos: int = 0, start_li: int = 0) -> List[HintCell]:
+    """Non-empty hints in walk order, starting from (start_pos, start_li)."""
+    return [c for c in get_cells(lang, length) if (c["pos"], c["li"]) >= (start_pos, start_li)]
+
+def _goal(lang: str, cell: HintCell) -> str:
+    n = len(cell["matches"])
+    return f"{n} word(s)" if lang == "en" else f"{n} unique Polish word(s)"
+
+def walk_rounds(lang: str, length: int, cells: List[HintCell], user_id: Optional[int] = None) -> Iterator[Round]:
+    """/memorize_all and /memorize_pl: every cell in order."""
+    for n, cell in enumerate(cells):
+        timeout = timeouts.hint_timeout(lang, cell, user_id)
+        prompt = (
+            f"🧠 Memorize — position {cell['pos']+1}/{length}, letter `{cell['letter'].upper()}`\n"
+            f"Hint:\n```{display_hint(cell['raw_hint'])}```\n"
+            f"Guess all {_goal(lang, cell)} in **{timeout} seconds**. Type `{STOP_WORD}` to stop.\n"
+            f"{len(cells) - n} hint(s) remaining."
+        )
+        yield Round(cell["raw_hint"], [prompt], timeout, cell, cell["pos"], cell["li"], lang=lang)
+
+def random_rounds(lang: str, length: int, weighted: bool = False,
+                  cycle: Optional[CellCycle] = None, user_id: Optional[int] = None) -> Iterator[Round]:
+    """
+    Random non-empty hints. Without `cycle`: independent draws (repeats allowed),
+    uniform or weighted by number of matches. With `cycle`: each hint once, in
+    the cycle's shuffled order, with a code in the prompt to resume from that hint.
+    """
+    sampler = None if cycle is not None else get_sampler(lang, length, weighted)
+    while True:
+        note = ""
+        if cycle is not None:
+            code = cycle.code()  # taken before the draw, so resuming replays this hint
+            cell = cycle.draw()
+            if cell is None:
+                return
+            note = f"\nHint {cycle.offset}/{len(cycle.cells)} · resume with `{code}`"
+        elif sampler is not None:
+            cell = sampler.draw()
+        else:
+            return
+        timeout = timeouts.hint_timeout(lang, cell, user_id)
+        if lang == "en":
+            prompt = (
+                f"🧩 **Random EN hint**\n"
+                f"Hint:\n```{display_hint(cell['raw_hint'])}```\n"
+                f"Guess all {len(cell['matches'])} matching word(s) in **{timeout} seconds**. "
+                f"Type `{STOP_WORD}` to stop."
+            )
+        else:
+            prompt = (
+                f"🧠 Random hint — position {cell['pos']+1}/{length}, letter `{cell['letter'].upper()}`\n"
+                f"Hint:\n```{display_hint(cell['raw_hint'])}```\n"
+                f"Guess all {_goal('pl', cell)} in **{timeout} seconds**!"
+            )
+        yield Round(cell["raw_hint"], [prompt + note], timeout, cell, cell["pos"], cell["li"], lang=lang)
+
+REVIEW_NEW_LIMIT = 20  # never-reviewed hints introduced per /review session
+
+def review_rounds(lang: str, length: int, user_id: int) -> Iterator[Round]:
+    """
+    /review: whatever the user's SM-2 schedule says is due, most overdue first,
+    then up to REVIEW_NEW_LIMIT hints they've never reviewed (least practised first).
+    """
+    cells = {(c["pos"], c["li"]): c for c in get_cells(lang, length)}
+    new = 0
+    seed = cells.keys()  # a view, not a copy; only read when the user's heaps are (re)built
+    while True:
+        now = time.time()
+        top = peek_review(user_id, lang, length, seed, now)
+        if top is None:
+            return
+        due, pos, li, reviewed = top
+        if due > now or (not reviewed and new >= REVIEW_NEW_LIMIT):
+            return
+        cell = cells.get((pos, li))
+        if cell is None:
+            return  # words.json changed under us
+        new += not reviewed
+        timeout = timeouts.hint_timeout(lang, cell, user_id)
+        prompt = (
+            f"📅 Review — position {pos+1}/{length}, letter `{cell['letter'].upper()}`"
+            f"{'' if reviewed else ' (new)'}\n"
+            f"Hint:\n```{display_hint(cell['raw_hint'])}```\n"
+            f"Guess all {_goal(lang, cell)} in **{timeout} seconds**. Type `{STOP_WORD}` to stop."
+        )
+        yield Round(cell["raw_hint"], [prompt], timeout, cell, pos, li, lang=lang)
+
+GTB_HINTS = 3
+GTB_HINT_SECONDS = 10.0
+
+def gtb_rounds(difficulty: str) -> Iterator[Round]:
+    """Random word of the difficulty; one more letter is revealed per stage."""
+    while True:
+        words = hint_atlas.current().words
+        entry = random.choice(words.lists[difficulty])
+        word = entry["english"]
+        revealed = {random.choice([i for i, c in enumerate(word) if c != ' '])}
+        initial_hint = get_hint(word, revealed)
+        prompts = [f"📝 New word! Length: **{len(word)}** Hint 1:\n```{display_hint(initial_hint)}```"]
+        for n in range(2, GTB_HINTS + 1):
+            unrev = [i for i in range(len(word)) if i not in revealed and word[i] != ' ']
+            if unrev:
+                revealed.add(random.choice(unrev))
+            prompts.append(f"🔎 Hint {n}: ```{display_hint(get_hint(word, revealed))}```")
+        # difficulty buckets are split by length, so the shared index gives the same matches
+        matches = get_possible_matches(initial_hint, words.en_hint_index)
+        footer = "📃 Words that matched the initial hint:\n" + ", ".join(f"`{m}`" for m in matches)
+        yield Round(initial_hint, prompts, GTB_HINT_SECONDS, GtbTarget(entry, words), footer=footer)
+
+# ---------- modes ----------
+
+class Mode:
+    """What a slash command configures: which hints, how guesses count, what gets scored."""
+    def __init__(self, name: str, rounds: Iterable[Round], answers: Callable[[object], Answers],
+                 scoring: Optional[Scoring] = None, on_miss: str = END,
+                 intro: Optional[str] = None, solved_text: Optional[str] = None,
+                 done_text: str = "✅ Finished all hints."):
+        self.name = name
+        self.rounds = rounds
+        self.answers = answers
+        self.scoring = scoring or Scoring()
+        self.on_miss = on_miss  # RETRY the hint (memorize_all), go on to the NEXT one (review) or END
+        self.intro = intro
+        self.solved_text = solved_text
+        self.done_text = done_text  # when the hints run out
+
+def record_round(owner_id: int, rnd: Round, attempt: Attempt) -> None:
+    """Feed a finished attempt at a hint cell to telemetry and the timeout model."""
+    if rnd.lang is None or rnd.li < 0:
+        return
+    completed = attempt.elapsed if attempt.outcome == SOLVED else None
+    telemetry.record(
+        owner_id, rnd.lang, len(rnd.raw_hint), rnd.pos, rnd.li, attempt.first_guess,
+        completed, attempt.wrong, attempt.outcome == MISSED,
+    )
+    timeouts.observe(owner_id, rnd.lang, rnd.target, completed)
@@ -0,0 +1,231 @@
+from __future__ import annotations
+import asyncio
+import random
+from array import array
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+from core import settings, word_loader
+from core.word_loader import EN_ALPHABET, POLISH_ALPHABET, Words
+
+class HintCell(TypedDict):
+    pos: int                 # 0-based position of the revealed letter
+    li: int                  # index of the letter in the language alphabet (-1 if not in it)
+    letter: str
+    raw_hint: str
+    ids: array               # matching entry ids (words.lists["normal"] / words.polish)
+    bits: int                # same ids as a bitset, for membership tests when resolving guesses
+    matches: List[str]       # matching words, pool order (Polish: deduped)
+    words: Words             # the load of words.json the ids point into
+
+ALPHABETS = {"en": EN_ALPHABET, "pl": POLISH_ALPHABET}
+
+def pl_tag(entry: dict) -> str:
+    return f"{entry['polish']}({entry.get('english','')})"
+
+def _build_cell(words: Words, lang: str, length: int, pos: int, li: int, letter: str) -> Optional[HintCell]:
+    raw_hint = '_' * pos + letter + '_' * (length - pos - 1)
+    index = words.en_hint_index if lang == "en" else words.pl_hint_index
+    bits = index.match_bits(raw_hint)
+    if not bits:
+        return None
+    ids = array("I", index.match_ids(raw_hint))
+    pool = index.words  # the decoded words, shared by every cell
+    if lang == "en":
+        matches = [pool[i] for i in ids]
+    else:
+        matches = list(dict.fromkeys(pool[i] for i in ids))
+    return {
+        "pos": pos, "li": li, "letter": letter, "raw_hint": raw_hint,
+        "ids": ids, "bits": bits, "matches": matches, "words": words,
+    }
+
+class CellSampler:
+    """
+    O(1) random draws over non-empty cells (Vose alias table), so random modes
+    never redraw empty (pos, letter) combinations. Uniform: every cell equally
+    likely. Weighted: proportional to the cell's number of matching entries.
+    """
+    __slots__ = ("cells", "_prob", "_alias")
+
+    def __init__(self, cells: List[HintCell], weights: Optional[List[float]] = None):
+        self.cells = cells
+        n = len(cells)
+        self._prob = [1.0] * n
+        self._alias = list(range(n))
+        if weights is None or n == 0:
+            return
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, g = small.pop(), large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = g
+            scaled[g] -= 1.0 - scaled[s]
+            (small if scaled[g] < 1.0 else large).append(g)
+        # leftovers are 1.0 up to float error
+
+    def draw(self, rng: random.Random = random) -> HintCell:
+        i = rng.randrange(len(self.cells))
+        return self.cells[i] if rng.random() < self._prob[i] else self.cells[self._alias[i]]
+
+# ---------- snapshots ----------
+# Everything built from one load of words.json (the words and indexes, every
+# length's cells, their samplers) lives in one Snapshot that is built whole in a
+# worker thread and swapped in with a single assignment. Nothing is modified in
+# place afterwards: cells keep a reference to their Words, so rounds that are
+# running when words.json changes finish against the data they started with.
+
+class Snapshot:
+    __slots__ = ("words", "_cells", "_samplers")
+
+    def __init__(self, words: Words):
+        self.words = words
+        # (lang, length) -> non-empty cells in session order (pos asc, then letter asc)
+        self._cells: Dict[Tuple[str, int], List[HintCell]] = {}
+        # (lang, length, weighted) -> sampler over that length's cells
+        self._samplers: Dict[Tuple[str, int, bool], CellSampler] = {}
+        pools = {"en": words.en_hint_index.words, "pl": words.pl_hint_index.words}
+        for lang, pool in pools.items():
+            for length in sorted({len(w) for w in pool}):
+                cells = []
+                for pos in range(length):
+                    for li, letter in enumerate(ALPHABETS[lang]):
+                        cell = _build_cell(words, lang, length, pos, li, letter)
+                        if cell is not None:
+                            cells.append(cell)
+                if cells:
+                    self._cells[(lang, length)] = cells
+                    self._samplers[(lang, length, False)] = CellSampler(cells)
+                    self._samplers[(lang, length, True)] = CellSampler(cells, [len(c["ids"]) for c in cells])
+
+    def cells(self, lang: str, length: int) -> List[HintCell]:
+        return self._cells.get((lang, length), [])
+
+    def sampler(self, lang: str, length: int, weighted: bool = False) -> Optional[CellSampler]:
+        return self._samplers.get((lang, length, weighted))
+
+_EMPTY = Snapshot(word_loader.EMPTY)
+_current: Optional[Snapshot] = None
+_reload_task: Optional[asyncio.Task] = None
+_failed: Optional[Tuple[int, int]] = None  # fingerprint whose reload failed; not retried
+
+def build() -> Snapshot:
+    """Read words.json and build a complete snapshot. Blocking."""
+    return Snapshot(word_loader.load_words())
+
+def load() -> None:
+    """Build the snapshot and make it current (the bot runs this in a worker thread at startup)."""
+    global _current
+    _current = build()
+
+async def _reload() -> None:
+    global _current, _failed
+    try:
+        snapshot = await asyncio.to_thread(build)
+    except Exception as e:
+        try:
+            _failed = word_loader.words_fingerprint()
+        except OSError:
+            pass
+        print(f"[WARN] Could not reload {settings.words_json()}, keeping the previous words: {e}")
+        return
+    _current = snapshot
+
+def current() -> Snapshot:
+    """
+    The snapshot in use. When words.json changed on disk a new one is built in a
+    worker thread and swapped in once complete; until then this one keeps serving.
+    """
+    global _current, _reload_task
+    snapshot = _current
+    try:
+        fingerprint = word_loader.words_fingerprint()
+    except OSError:
+        return snapshot or _EMPTY  # file vanished; keep serving what we have
+    if snapshot is None:
+        # nothing ran load() (scripts, tools): build it right here
+        snapshot = _current = build()
+        return snapshot
+    if fingerprint in (snapshot.words.fingerprint, _failed):
+        return snapshot
+    if _reload_task is None or _reload_task.done():
+        try:
+            _reload_task = asyncio.get_running_loop().create_task(_reload())
+        except RuntimeError:  # no event loop: nothing to block, reload inline
+            snapshot = _current = build()
+    return snapshot
+
+def get_cells(lang: str, length: int) -> List[HintCell]:
+    """
+    All non-empty (position, letter) hints for a language/length, in the order
+    /memorize_en and /memorize_pl walk them, from the current snapshot.
+    """
+    return current().cells(lang, length)
+
+def get_sampler(lang: str, length: int, weighted: bool = False) -> Optional[CellSampler]:
+    """Sampler for a language/length; None when no hint of that length has matches."""
+    return current().sampler(lang, length, weighted)
+
+class CellCycle:
+    """
+    Every non-empty cell exactly once, in a seeded Fisher–Yates order that is
+    materialized lazily: each draw does one swap, recorded sparsely, so a draw
+    is O(1) and nothing is shuffled up front. (seed, offset) is the whole
+    state; resuming replays `offset` swaps. Codes assume words.json hasn't
+    changed in between (a different cell list gives a different order).
+    """
+    __slots__ = ("cells", "seed", "offset", "_rng", "_swaps")
+
+    def __init__(self, cells: List[HintCell], seed: int, offset: int = 0):
+        if not 0 <= offset <= len(cells):
+            raise ValueError(f"offset {offset} out of range for {len(cells)} hints")
+        self.cells = cells
+        self.seed = seed
+        self.offset = 0
+        self._rng = random.Random(seed)
+        self._swaps: Dict[int, int] = {}  # slot -> cell index, only for slots touched by a swap
+        for _ in range(offset):
+            self.draw()
+
+    def draw(self) -> Optional[HintCell]:
+        """Next cell, or None once every cell has been drawn."""
+        i, n = self.offset, len(self.cells)
+        if i >= n:
+            return None
+        j = self._rng.randrange(i, n)
+        picked = self._swaps.get(j, j)
+        self._swaps[j] = self._swaps.pop(i, i)
+        self.offset += 1
+        return self.cells[picked]
+
+    def code(self) -> str:
+        """Compact resume code for the current position."""
+        return f"{self.seed:08x}-{self.offset}"
+
+def new_cycle(lang: str, length: int, code: Optional[str] = None) -> Optional[CellCycle]:
+    """
+    A fresh cycle over the length's non-empty cells, or one resumed from a
+    code like '1a2b3c4d-57'. None when there are no hints; ValueError for a bad code.
+    """
+    cells = get_cells(lang, length)
+    if not cells:
+        return None
+    if code is None:
+        return CellCycle(cells, random.getrandbits(32))
+    seed, _, offset = code.strip().partition("-")
+    return CellCycle(cells, int(seed, 16), int(offset))
+
+def resolve(lang: str, cell: HintCell, guess: str) -> List[int]:
+    """
+    Entry ids of this hint that accept 'guess': one lookup in the answer index
+    of the cell's own Words plus a bit test against the hint's ids.
+    """
+    words = cell["words"]
+    index = words.en_answer_index if lang == "en" else words.pl_answer_index
+    ids = index.get(word_loader.normalize_answer(guess))
+    if not ids:
+        return []
+    bits = cell["bits"]
+    return [i for i in ids if bits >> i & 1]
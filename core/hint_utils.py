@@ -0,0 +1,130 @@
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+def get_hint(word: str, revealed_indexes: Iterable[int]) -> str:
+    """
+    Produce a raw hint with underscores for hidden letters and real spaces preserved.
+    BUGFIX: keep spaces as spaces (previously compared to empty string).
+    """
+    ri = set(revealed_indexes)
+    return ''.join(
+        (letter if (letter == ' ' or idx in ri) else '_')
+        for idx, letter in enumerate(word)
+    )
+
+def display_hint(raw_hint: str) -> str:
+    """
+    Pretty hint for Discord monospace:
+    - '_' -> '_ '
+    - ' ' -> extra spaces to visually separate words
+    """
+    out = []
+    for c in raw_hint:
+        if c == '_':
+            out.append('_ ')
+        elif c == ' ':
+            out.append('    ')
+        else:
+            out.append(f"{c} ")
+    return ''.join(out)
+
+def _to_bitset(ids: Iterable[int]) -> int:
+    """Pack ascending word ids into a Python int used as a bitset."""
+    ids = list(ids)
+    if not ids:
+        return 0
+    buf = bytearray((ids[-1] >> 3) + 1)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+def _iter_bits(bits: int) -> Iterable[int]:
+    """Yield the set bit positions of 'bits' in ascending order."""
+    digits = bin(bits)[:1:-1]  # least significant bit first
+    i = digits.find('1')
+    while i != -1:
+        yield i
+        i = digits.find('1', i + 1)
+
+class HintIndex:
+    """
+    Positional inverted index over a word pool.
+    Postings are keyed by (length, position, lowercased char) and stored as
+    bitsets of word ids (= positions in the pool), so matching a hint is a
+    handful of AND operations instead of a scan over every word.
+    """
+    __slots__ = ("words", "_by_length", "_postings")
+
+    def __init__(self, words: Sequence[str]):
+        self.rebuild(words)
+
+    def rebuild(self, words: Sequence[str]) -> None:
+        """Re-index in place (keeps references held by other modules valid)."""
+        self.words: List[str] = list(words)
+        by_length: Dict[int, List[int]] = {}
+        postings: Dict[Tuple[int, int, str], List[int]] = {}
+        for wid, w in enumerate(self.words):
+            L = len(w)
+            by_length.setdefault(L, []).append(wid)
+            for i, c in enumerate(w):
+                postings.setdefault((L, i, c.lower()), []).append(wid)
+        self._by_length: Dict[int, int] = {L: _to_bitset(ids) for L, ids in by_length.items()}
+        self._postings: Dict[Tuple[int, int, str], int] = {k: _to_bitset(ids) for k, ids in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def match_bits(self, raw_hint: str) -> int:
+        """Bitset of word ids matching the hint (same rules as get_possible_matches)."""
+        L = len(raw_hint)
+        bits = self._by_length.get(L, 0)
+        postings = self._postings
+        for i, hc in enumerate(raw_hint):
+            if not bits:
+                break
+            if hc == '_':
+                # hidden char can't be a space
+                bits &= ~postings.get((L, i, ' '), 0)
+            else:
+                bits &= postings.get((L, i, hc.lower()), 0)
+        return bits
+
+    def match_ids(self, raw_hint: str) -> List[int]:
+        """Word ids matching the hint, in pool order."""
+        return list(_iter_bits(self.match_bits(raw_hint)))
+
+    def match(self, raw_hint: str) -> List[str]:
+        """Words matching the hint, in pool order."""
+        words = self.words
+        return [words[i] for i in _iter_bits(self.match_bits(raw_hint))]
+
+def get_possible_matches(raw_hint: str, word_pool: Union[List[str], HintIndex]) -> List[str]:
+    """
+    Returns words that match the hint exactly (length, letters, spaces).
+    Pass a prebuilt HintIndex to answer from postings instead of scanning the pool.
+    """
+    if isinstance(word_pool, HintIndex):
+        return word_pool.match(raw_hint)
+    L = len(raw_hint)
+    matches: List[str] = []
+    for w in word_pool:
+        if len(w) != L:
+            continue
+        ok = True
+        for i, hc in enumerate(raw_hint):
+            wc = w[i]
+            if hc == '_':
+                if wc == ' ':  # hidden char can't be a space
+                    ok = False
+                    break
+            elif hc == ' ':
+                if wc != ' ':
+                    ok = False
+                    break
+            else:
+                if hc.lower() != wc.lower():
+                    ok = False
+                    break
+        if ok:
+            matches.append(w)
+    return matches
+
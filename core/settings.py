@@ -0,0 +1,31 @@
+from __future__ import annotations
+import os
+
+# ---------- core settings ----------
+# The core (hint matching, word lists, stats, telemetry, the game rules in
+# core.game) never imports discord or config: the bot is one front-end, offline
+# tools and benches are others. Settings come from the environment, with .env
+# read the first time one is asked for (if python-dotenv is installed), so
+# importing a core module costs nothing but its own code.
+
+_dotenv_loaded = False
+
+def env(name: str, default: str) -> str:
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        _dotenv_loaded = True
+        try:
+            from dotenv import load_dotenv
+        except ImportError:
+            pass
+        else:
+            load_dotenv()
+    return os.getenv(name, default)
+
+def words_json() -> str:
+    """Path to data/words.json."""
+    return env("WORDS_JSON", os.path.join("data", "words.json"))
+
+def words_bin() -> str:
+    """Compiled binary snapshot of words_json() (rebuilt automatically when the JSON changes)."""
+    return env("WORDS_BIN", os.path.splitext(words_json())[0] + ".bin")
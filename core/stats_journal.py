@@ -0,0 +1,86 @@
+from __future__ import annotations
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Iterator, List
+
+# ---------- append-only stats journal ----------
+# Each mutation is one JSON array per line, carrying ABSOLUTE values:
+#   ["run", user_id, lang, length, run_started, run_len, record, record_updated_at,
+#           record_last_pos, record_last_li, count_record]
+#   ["rep", user_id, lang, length, pos, li, count]
+#   ["review", user_id, lang, length, pos, li, due, ease, interval, streak]
+# Absolute values make replay idempotent, so replaying a journal that is already
+# folded into the snapshot (crash mid-compaction) can't double count anything.
+
+class StatsJournal:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.rotated = self.path.with_suffix(self.path.suffix + ".1")  # being folded into the snapshot
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(self.path, "a", encoding="utf-8")
+        self.size = self._f.tell()
+
+    def append(self, record: list) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        self._f.write(line)
+        self._f.flush()  # hand it to the OS: a crash loses at most the record being written
+        self.size += len(line.encode("utf-8"))
+
+    def replay(self) -> Iterator[list]:
+        """Records from the rotated journal (if a compaction was interrupted), then the live one."""
+        for p in (self.rotated, self.path):
+            if not p.exists():
+                continue
+            with open(p, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # torn tail write
+                    if isinstance(rec, list) and rec:
+                        yield rec
+
+    def rotate(self) -> None:
+        """
+        Start a fresh journal; the old one stays at .1 until the snapshot is written.
+        If .1 is still there (the last compaction failed), its records were never
+        snapshotted either, so the live journal is appended to it instead of replacing it.
+        """
+        self._f.close()
+        if self.rotated.exists():
+            with open(self.path, "rb") as src, open(self.rotated, "ab+") as dst:
+                dst.seek(0, os.SEEK_END)
+                if dst.tell():
+                    dst.seek(-1, os.SEEK_END)
+                    if dst.read(1) != b"\n":
+                        dst.write(b"\n")  # don't glue our first record onto a torn tail
+                shutil.copyfileobj(src, dst)
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.remove(self.path)
+        else:
+            os.replace(self.path, self.rotated)
+        self._f = open(self.path, "a", encoding="utf-8")
+        self.size = 0
+
+    def drop_rotated(self) -> None:
+        try:
+            os.remove(self.rotated)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        self._f.close()
+
+def run_record(user_id, lang: str, length, values: List) -> List:
+    """values: the run/record fields in stats_sqlite.RUN_FIELDS order."""
+    return ["run", user_id, lang, length, *values]
+
+def rep_record(user_id, lang: str, length, pos: int, li: int, count: int) -> List:
+    return ["rep", user_id, lang, length, pos, li, count]
+
+def review_record(user_id, lang: str, length, pos: int, li: int, values: List) -> List:
+    """values: stats_sqlite.REVIEW_FIELDS order."""
+    return ["review", user_id, lang, length, pos, li, *values]
@@ -0,0 +1,245 @@
+from __future__ import annotations
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, Sequence
+
+# ---------- SQLite stats backend ----------
+# One row per (user, lang, length) for run/record fields and one row per
+# (user, lang, length, pos, letter_idx) for repetitions, so every stats call
+# upserts only the rows it changed instead of rewriting a whole file.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    user_id           INTEGER NOT NULL,
+    lang              TEXT    NOT NULL,
+    length            INTEGER NOT NULL,
+    run_started       INTEGER NOT NULL DEFAULT 0,
+    run_len           INTEGER NOT NULL DEFAULT 0,
+    record            INTEGER NOT NULL DEFAULT 0,
+    record_updated_at TEXT    NOT NULL DEFAULT '',
+    record_last_pos   INTEGER,
+    record_last_li    INTEGER,
+    count_record      INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, lang, length)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS runs_by_record ON runs (lang, length, record DESC, record_updated_at);
+
+CREATE TABLE IF NOT EXISTS repetitions (
+    user_id    INTEGER NOT NULL,
+    lang       TEXT    NOT NULL,
+    length     INTEGER NOT NULL,
+    pos        INTEGER NOT NULL,
+    letter_idx INTEGER NOT NULL,
+    count      INTEGER NOT NULL,
+    PRIMARY KEY (user_id, lang, length, pos, letter_idx)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS reviews (
+    user_id    INTEGER NOT NULL,
+    lang       TEXT    NOT NULL,
+    length     INTEGER NOT NULL,
+    pos        INTEGER NOT NULL,
+    letter_idx INTEGER NOT NULL,
+    due        INTEGER NOT NULL,
+    ease       INTEGER NOT NULL,
+    interval   INTEGER NOT NULL,
+    streak     INTEGER NOT NULL,
+    PRIMARY KEY (user_id, lang, length, pos, letter_idx)
+) WITHOUT ROWID;
+"""
+
+RUN_FIELDS = ("run_started", "run_len", "record", "record_updated_at",
+              "record_last_pos", "record_last_li", "count_record")
+# per reviewed (pos, letter): [due (unix s), ease x100, interval (days), successful-review streak]
+REVIEW_FIELDS = ("due", "ease", "interval", "streak")
+
+def _rep_key(key: str):
+    """'pos-li' -> (pos, li), or None if malformed."""
+    try:
+        p, li = key.split("-", 1)
+        return int(p), int(li)
+    except (AttributeError, ValueError):
+        return None
+
+def upgrade_leaf(leaf: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize one stored (user, lang, length) leaf to the current shape.
+    Handles the legacy layout still found in data/stats.json:
+      {"reps": {...}, "completed": {...}, "record": {"pos", "letter_idx", "updated_at"}, "run": {...}}
+    Legacy records stored only the endpoint; the streak value becomes the number of
+    completed hints up to and including it. Legacy runs are not resumed.
+    """
+    if "reps" in leaf or "run" in leaf or isinstance(leaf.get("record"), dict):
+        reps = leaf.get("reps", {}) or {}
+        rec = leaf.get("record", {}) or {}
+        rec_pos, rec_li = rec.get("pos", -1), rec.get("letter_idx", -1)
+        has_record = isinstance(rec_pos, int) and isinstance(rec_li, int) and rec_pos >= 0 and rec_li >= 0
+        value = 0
+        if has_record:
+            for key, done in (leaf.get("completed", {}) or {}).items():
+                k = _rep_key(key)
+                if done and k is not None and k <= (rec_pos, rec_li):
+                    value += 1
+        return {
+            "run_started": False,
+            "run_len": 0,
+            "record": value,
+            "record_updated_at": rec.get("updated_at", "") if has_record else "",
+            "record_last_pos": rec_pos if has_record else None,
+            "record_last_li": rec_li if has_record else None,
+            "repetitions": _int_values(reps),
+            "count_record": False,
+            "review": {},
+        }
+    return {
+        "run_started": bool(leaf.get("run_started", False)),
+        "run_len": int(leaf.get("run_len", 0)),
+        "record": int(leaf.get("record", 0)),
+        "record_updated_at": leaf.get("record_updated_at", ""),
+        "record_last_pos": leaf.get("record_last_pos", None),
+        "record_last_li": leaf.get("record_last_li", None),
+        "repetitions": _int_values(leaf.get("repetitions", {}) or {}),
+        "count_record": bool(leaf.get("count_record", False)),
+        "review": _review_values(leaf.get("review", {}) or {}),
+    }
+
+def _int_values(reps: Dict[str, Any]) -> Dict[str, int]:
+    out = {}
+    for rk, rv in reps.items():
+        try:
+            out[rk] = int(rv)
+        except (TypeError, ValueError):
+            pass
+    return out
+
+def _review_values(review: Dict[str, Any]) -> Dict[str, list]:
+    out = {}
+    for rk, rv in review.items():
+        try:
+            values = [int(v) for v in rv]
+        except (TypeError, ValueError):
+            continue
+        if len(values) == len(REVIEW_FIELDS):
+            out[rk] = values
+    return out
+
+class SqliteStats:
+    def __init__(self, path: Path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path), isolation_level=None)  # autocommit; one statement per upsert
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def load_user(self, user_id: int) -> Dict[str, Dict[int, Dict[str, Any]]]:
+        """Every leaf of one user, in the same plain shape stats.json uses."""
+        out: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        cur = self.conn.execute(
+            f"SELECT lang, length, {', '.join(RUN_FIELDS)} FROM runs WHERE user_id = ?", (user_id,)
+        )
+        for lang, length, *values in cur:
+            leaf = dict(zip(RUN_FIELDS, values))
+            leaf["repetitions"] = {}
+            out.setdefault(lang, {})[length] = leaf
+        cur = self.conn.execute(
+            "SELECT lang, length, pos, letter_idx, count FROM repetitions WHERE user_id = ?", (user_id,)
+        )
+        for lang, length, pos, li, count in cur:
+            leaf = out.setdefault(lang, {}).setdefault(length, {"repetitions": {}})
+            leaf["repetitions"][f"{pos}-{li}"] = count
+        cur = self.conn.execute(
+            f"SELECT lang, length, pos, letter_idx, {', '.join(REVIEW_FIELDS)} FROM reviews WHERE user_id = ?",
+            (user_id,),
+        )
+        for lang, length, pos, li, *values in cur:
+            leaf = out.setdefault(lang, {}).setdefault(length, {"repetitions": {}})
+            leaf.setdefault("review", {})[f"{pos}-{li}"] = values
+        return {lang: {length: upgrade_leaf(leaf) for length, leaf in lengths.items()}
+                for lang, lengths in out.items()}
+
+    def top_records(self, lang: str, length: int, k: int):
+        """(record, record_updated_at, user_id) of the k best records, best first."""
+        return self.conn.execute(
+            "SELECT record, record_updated_at, user_id FROM runs "
+            "WHERE lang = ? AND length = ? AND record > 0 "
+            "ORDER BY record DESC, record_updated_at, user_id LIMIT ?",
+            (lang, length, k),
+        ).fetchall()
+
+    def upsert_run(self, user_id: int, lang: str, length: int, values: Sequence[Any]) -> None:
+        """values: the RUN_FIELDS columns, in order."""
+        self.conn.execute(
+            f"INSERT INTO runs (user_id, lang, length, {', '.join(RUN_FIELDS)}) "
+            f"VALUES (?, ?, ?, {', '.join('?' * len(RUN_FIELDS))}) "
+            "ON CONFLICT (user_id, lang, length) DO UPDATE SET "
+            + ", ".join(f"{f} = excluded.{f}" for f in RUN_FIELDS),
+            (user_id, lang, length, *values),
+        )
+
+    def upsert_rep(self, user_id: int, lang: str, length: int, pos: int, li: int, count: int) -> None:
+        self.conn.execute(
+            "INSERT INTO repetitions (user_id, lang, length, pos, letter_idx, count) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (user_id, lang, length, pos, letter_idx) DO UPDATE SET count = excluded.count",
+            (user_id, lang, length, pos, li, count),
+        )
+
+    def upsert_review(self, user_id: int, lang: str, length: int, pos: int, li: int, values: Sequence[int]) -> None:
+        """values: the REVIEW_FIELDS columns, in order."""
+        self.conn.execute(
+            f"INSERT INTO reviews (user_id, lang, length, pos, letter_idx, {', '.join(REVIEW_FIELDS)}) "
+            f"VALUES (?, ?, ?, ?, ?, {', '.join('?' * len(REVIEW_FIELDS))}) "
+            "ON CONFLICT (user_id, lang, length, pos, letter_idx) DO UPDATE SET "
+            + ", ".join(f"{f} = excluded.{f}" for f in REVIEW_FIELDS),
+            (user_id, lang, length, pos, li, *values),
+        )
+
+    def import_json(self, data: Dict[str, Any]) -> int:
+        """Load a whole stats.json payload (current or legacy shape); returns the number of leaves."""
+        n = 0
+        self.conn.execute("BEGIN")
+        try:
+            for user_id_str, langs in data.items():
+                user_id = int(user_id_str)
+                for lang, lengths in langs.items():
+                    for length_str, raw_leaf in lengths.items():
+                        length = int(length_str)
+                        leaf = upgrade_leaf(raw_leaf)
+                        self.upsert_run(user_id, lang, length, [leaf[f] for f in RUN_FIELDS])
+                        for key, count in leaf["repetitions"].items():
+                            k = _rep_key(key)
+                            if k is not None:
+                                self.upsert_rep(user_id, lang, length, k[0], k[1], count)
+                        for key, values in leaf["review"].items():
+                            k = _rep_key(key)
+                            if k is not None:
+                                self.upsert_review(user_id, lang, length, k[0], k[1], values)
+                        n += 1
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return n
+
+    def close(self) -> None:
+        self.conn.close()
+
+def import_json_file(json_path: str, db_path: str) -> int:
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    db = SqliteStats(Path(db_path))
+    try:
+        return db.import_json(data)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    # python -m core.stats_sqlite stats.json [stats.sqlite3]
+    if len(sys.argv) < 2:
+        print("usage: python -m core.stats_sqlite STATS_JSON [STATS_DB]")
+        sys.exit(2)
+    src = sys.argv[1]
+    dst = sys.argv[2] if len(sys.argv) > 2 else "stats.sqlite3"
+    print(f"✅ Imported {import_json_file(src, dst)} stats entries from {src} into {dst}")
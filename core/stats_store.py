@@ -0,0 +1,696 @@
+from __future__ import annotations
+import json
+import os
+from pathlib import Path
+from collections import OrderedDict, defaultdict
+import asyncio
+import bisect
+import heapq
+import time
+from array import array
+from typing import Dict, Any, Iterable, Optional, Tuple
+from core.stats_sqlite import SqliteStats, upgrade_leaf, RUN_FIELDS, REVIEW_FIELDS
+from core.stats_journal import StatsJournal, run_record, rep_record, review_record
+from core.settings import env
+
+# ---------- persistence ----------
+# Settings are read from the environment on first use (see core.settings), so
+# importing this module doesn't load .env.
+
+def stats_path() -> Path:
+    """The stats snapshot; ./stats.json unless env STATS_FILE says otherwise."""
+    return Path(env("STATS_FILE", "stats.json")).resolve()
+
+# Lock striping: a user's calls serialize on one of STATS_LOCK_STRIPES locks, so
+# sessions of different users never queue behind each other. Nothing here needs a
+# global lock: state changes never await midway, so _snapshot() (which doesn't
+# await either) always sees whole mutations. STATS_LOCK_STRIPES=1 = one global lock.
+_STRIPES: list = []  # built on the first call
+
+def lock_stripes() -> int:
+    return max(1, int(env("STATS_LOCK_STRIPES", "64")))
+
+def _user_lock(user_id) -> asyncio.Lock:
+    if not _STRIPES:
+        _STRIPES.extend(asyncio.Lock() for _ in range(lock_stripes()))
+    return _STRIPES[hash(user_id) % len(_STRIPES)]
+
+# Storage backend (env STATS_BACKEND):
+#   json   - the whole tree lives in STATS_FILE, rewritten by the write-behind flusher below
+#   sqlite - per-row upserts into STATS_DB (WAL); users are loaded on first access
+#   journal - STATS_FILE is a snapshot; every change is appended to STATS_JOURNAL and
+#             folded into a fresh snapshot once the journal passes STATS_JOURNAL_MAX_BYTES
+def stats_backend() -> str:
+    return env("STATS_BACKEND", "json").strip().lower()
+
+def stats_db_path() -> Path:
+    return Path(env("STATS_DB", "stats.sqlite3")).resolve()
+
+def stats_journal_path() -> Path:
+    return Path(env("STATS_JOURNAL", str(stats_path()) + ".journal")).resolve()
+
+def journal_max_bytes() -> int:
+    return int(env("STATS_JOURNAL_MAX_BYTES", str(1 << 20)))
+
+_db: SqliteStats | None = None
+_db_opened = False
+_hydrated: set = set()  # sqlite: users already loaded into _state
+_journal: StatsJournal | None = None
+_compact_task: asyncio.Task | None = None
+
+def _sqlite() -> SqliteStats | None:
+    """The sqlite store if STATS_BACKEND=sqlite, else None."""
+    global _db, _db_opened
+    # The connection belongs to the thread that opens it: this runs on the event
+    # loop's first access to a user, never in load()'s worker thread
+    if not _db_opened:
+        _db_opened = True
+        if stats_backend() == "sqlite":
+            _db = SqliteStats(stats_db_path())
+    return _db
+
+# user -> version, bumped by every mutation of that user's stats (process-local);
+# lets callers cache anything derived from get_stats() keyed by (user, version)
+_versions: Dict[int, int] = {}
+
+# write-behind: mutations only mark the store dirty; the file is rewritten
+# STATS_FLUSH_INTERVAL seconds after the first unsaved change, or as soon as
+# STATS_FLUSH_MAX_DIRTY changes are pending. STATS_FLUSH_INTERVAL=0 writes on every change.
+def flush_interval() -> float:
+    return float(env("STATS_FLUSH_INTERVAL", "5"))
+
+def flush_max_dirty() -> int:
+    return int(env("STATS_FLUSH_MAX_DIRTY", "50"))
+
+_WRITE_LOCK = asyncio.Lock()      # one file write at a time
+_dirty = 0                        # mutations not yet on disk
+_generation = 0                   # bumped by every mutation
+_saved_generation = 0             # last generation included in a written snapshot
+_flush_task: asyncio.Task | None = None
+_flush_now = asyncio.Event()      # set to cut the flush delay short
+
+# Letters per language (len(EN_ALPHABET), len(POLISH_ALPHABET)); row width of the repetitions array
+ALPHABET_LEN = {"en": 26, "pl": 35}
+REVIEW_WIDTH = len(REVIEW_FIELDS)  # u32 slots per cell in StatsLeaf.review
+
+def _regrid(old: array, rows: int, stride: int, new_rows: int, new_stride: int, width: int) -> array:
+    """Copy a rows x stride x width array into a zeroed new_rows x new_stride x width one."""
+    new = array(old.typecode, bytes(old.itemsize * new_rows * new_stride * width))
+    row, new_row = stride * width, new_stride * width
+    for r in range(rows):
+        new[r * new_row:r * new_row + row] = old[r * row:(r + 1) * row]
+    return new
+
+class StatsLeaf:
+    """
+    Stats of one (user, lang, length). Repetitions live in a flat array('I')
+    of rows x stride, indexed by pos * stride + li, instead of a dict of "pos-li" strings.
+    Spaced-repetition state uses the same grid with REVIEW_WIDTH slots per cell
+    (due, ease x100, interval days, streak); it stays None until the first review.
+    """
+    __slots__ = ("run_started", "run_len", "record", "record_updated_at",
+                 "record_last_pos", "record_last_li", "count_record", "stride", "reps", "review")
+
+    def __init__(self, length: int, stride: int):
+        self.run_started = False        # currently in an eligible contiguous run
+        self.run_len = 0                # current contiguous run length
+        self.record = 0                 # best contiguous run length
+        self.record_updated_at = ""     # ISO timestamp when record last updated
+        self.record_last_pos = None     # 0-based position where record run last succeeded
+        self.record_last_li = None      # 0-based letter index where record run last succeeded
+        self.count_record = False       # this run is eligible to update record (no start_hint)
+        self.stride = stride
+        self.reps = array("I", bytes(4 * max(length, 1) * stride))
+        self.review: Optional[array] = None
+
+    def _index(self, pos: int, li: int) -> int:
+        rows = len(self.reps) // self.stride
+        if li >= self.stride or pos >= rows:
+            # letter outside the expected alphabet widens rows; a longer word adds rows
+            stride, new_rows = max(self.stride, li + 1), max(rows, pos + 1)
+            self.reps = _regrid(self.reps, rows, self.stride, new_rows, stride, 1)
+            if self.review is not None:
+                self.review = _regrid(self.review, rows, self.stride, new_rows, stride, REVIEW_WIDTH)
+            self.stride = stride
+        return pos * self.stride + li
+
+    def run_values(self) -> list:
+        return [getattr(self, f) for f in RUN_FIELDS]
+
+    def get_rep(self, pos: int, li: int) -> int:
+        i = pos * self.stride + li
+        return self.reps[i] if 0 <= li < self.stride and 0 <= i < len(self.reps) else 0
+
+    def set_rep(self, pos: int, li: int, count: int):
+        i = self._index(pos, li)  # may reallocate self.reps, so resolve it first
+        self.reps[i] = count
+
+    def bump(self, pos: int, li: int) -> int:
+        i = self._index(pos, li)
+        self.reps[i] += 1
+        return self.reps[i]
+
+    def iter_reps(self):
+        """(pos, li, count) for every non-zero counter."""
+        stride = self.stride
+        for i, c in enumerate(self.reps):
+            if c:
+                yield divmod(i, stride) + (c,)
+
+    def get_review(self, pos: int, li: int) -> Optional[tuple]:
+        """(due, ease, interval, streak), or None if the cell was never reviewed."""
+        i = pos * self.stride + li
+        if self.review is None or not (0 <= li < self.stride and 0 <= i < len(self.reps)):
+            return None
+        values = tuple(self.review[i * REVIEW_WIDTH:(i + 1) * REVIEW_WIDTH])
+        return values if values[0] else None
+
+    def set_review(self, pos: int, li: int, values) -> None:
+        if self.review is None:
+            self.review = array("I", bytes(4 * len(self.reps) * REVIEW_WIDTH))
+        i = self._index(pos, li) * REVIEW_WIDTH
+        self.review[i:i + REVIEW_WIDTH] = array("I", values)
+
+    def iter_reviews(self):
+        """(pos, li, (due, ease, interval, streak)) for every reviewed cell."""
+        if self.review is None:
+            return
+        w = REVIEW_WIDTH
+        for i in range(len(self.reps)):
+            if self.review[i * w]:
+                yield divmod(i, self.stride) + (tuple(self.review[i * w:(i + 1) * w]),)
+
+    def load(self, leaf: Dict[str, Any]):
+        """Fill from a stored leaf (current or legacy JSON shape)."""
+        plain = upgrade_leaf(leaf)
+        for f in RUN_FIELDS:
+            setattr(self, f, plain[f])
+        for key, count in plain["repetitions"].items():
+            try:
+                p, li = key.split("-", 1)
+                p, li = int(p), int(li)
+            except ValueError:
+                continue
+            if p >= 0 and li >= 0:
+                self.set_rep(p, li, count)
+        for key, values in plain["review"].items():
+            try:
+                p, li = key.split("-", 1)
+                p, li = int(p), int(li)
+            except ValueError:
+                continue
+            if p >= 0 and li >= 0:
+                self.set_review(p, li, values)
+
+    def to_plain(self) -> Dict[str, Any]:
+        """JSON shape, same as stats.json has always used (plus "review" once something was reviewed)."""
+        out = dict(zip(RUN_FIELDS, self.run_values()))
+        out["repetitions"] = {f"{p}-{li}": c for p, li, c in self.iter_reps()}
+        review = {f"{p}-{li}": list(v) for p, li, v in self.iter_reviews()}
+        if review:
+            out["review"] = review
+        return out
+
+class _LangLeaves(dict):
+    """length -> StatsLeaf for one (user, lang); leaves are created on first access."""
+    __slots__ = ("stride",)
+
+    def __init__(self, lang: str):
+        super().__init__()
+        self.stride = ALPHABET_LEN.get(lang, 1)
+
+    def __missing__(self, length: int) -> StatsLeaf:
+        leaf = self[length] = StatsLeaf(length, self.stride)
+        return leaf
+
+class _UserLangs(dict):
+    """lang -> _LangLeaves for one user."""
+    __slots__ = ()
+
+    def __missing__(self, lang: str) -> _LangLeaves:
+        leaves = self[lang] = _LangLeaves(lang)
+        return leaves
+
+# user -> lang -> length -> leaf
+_state: Dict[int, Dict[str, Dict[int, StatsLeaf]]] = defaultdict(_UserLangs)
+
+def _from_plain(d):
+    """Hydrate plain dict back into our nested structure."""
+    global _state
+    _state = defaultdict(_UserLangs)
+    for user_id_str, langs in d.items():
+        try:
+            user_id = int(user_id_str)
+        except ValueError:
+            # keys might already be int if we saved that way
+            user_id = user_id_str
+        for lang, lengths in langs.items():
+            for length_str, leaf in lengths.items():
+                try:
+                    length = int(length_str)
+                except ValueError:
+                    continue
+                _state[user_id][lang][length].load(leaf)
+
+def _apply_record(rec: list):
+    """Replay one journal record onto _state."""
+    kind, user_id, lang, length = rec[0], rec[1], rec[2], rec[3]
+    b = _state[user_id][lang][length]
+    if kind == "run":
+        for f, v in zip(RUN_FIELDS, rec[4:11]):
+            setattr(b, f, v)
+    elif kind == "rep":
+        pos, li, count = rec[4:7]
+        b.set_rep(pos, li, count)
+    elif kind == "review":
+        pos, li = rec[4:6]
+        b.set_review(pos, li, rec[6:6 + REVIEW_WIDTH])
+
+def _load_from_disk():
+    path = stats_path()
+    if not path.exists():
+        return
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        _from_plain(data)
+    except Exception:
+        # if file is corrupted, ignore and start fresh (could log)
+        pass
+
+def _atomic_write_text(path: Path, text: str):
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())  # durable before the rotated journal it replaces is dropped
+    os.replace(tmp, path)
+
+# user -> (version, plain dict) from the last snapshot; users whose version hasn't
+# moved since are reused as-is, so a snapshot only converts the users that changed
+_plain_users: Dict[Any, Tuple[int, dict]] = {}
+
+def _plain_user(user_id, langs) -> dict:
+    version = _versions.get(user_id, 0)
+    cached = _plain_users.get(user_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    # JSON keys must be strings; convert the length keys to str
+    plain = {
+        lang: {str(length): leaf.to_plain() for length, leaf in lengths.items()}
+        for lang, lengths in langs.items()
+    }
+    _plain_users[user_id] = (version, plain)
+    return plain
+
+def _snapshot() -> dict:
+    """
+    Plain copy of _state, safe to serialize off the event loop. The per-user dicts
+    are shared with later snapshots and never modified after they're built.
+    """
+    return {str(user_id): _plain_user(user_id, langs) for user_id, langs in _state.items()}
+
+def _write_snapshot(payload: dict):
+    path = stats_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    _atomic_write_text(path, text)
+
+async def _save_to_disk():
+    """
+    Write-through save. Callers that queued behind a write whose snapshot already
+    contains their change return without writing again (group commit).
+    """
+    global _saved_generation
+    wanted = _generation
+    async with _WRITE_LOCK:
+        if _saved_generation >= wanted:
+            return
+        taken = _generation
+        await asyncio.to_thread(_write_snapshot, _snapshot())
+        _saved_generation = taken
+
+async def flush() -> bool:
+    """Write pending changes now (no-op if nothing changed since the last write); False if the write failed."""
+    global _dirty
+    async with _WRITE_LOCK:
+        if not _dirty:
+            return True
+        payload = _snapshot()
+        pending, _dirty = _dirty, 0
+        _flush_now.clear()
+        try:
+            await asyncio.to_thread(_write_snapshot, payload)
+        except OSError as e:
+            print(f"[WARN] Could not save stats to {stats_path()}: {e}")
+            _dirty += pending  # retry with the next flush
+            return False
+        return True
+
+async def _flush_later():
+    # Keeps going while changes are pending: a mutation that lands during a write
+    # sees this task still running and doesn't schedule another one. After a
+    # failed write it stops; the next mutation schedules a fresh attempt.
+    while True:
+        try:
+            await asyncio.wait_for(_flush_now.wait(), timeout=flush_interval())
+        except asyncio.TimeoutError:
+            pass
+        if not await flush() or not _dirty:
+            return
+
+async def _persist(user_id: int, lang: str, length: int, rep: tuple | None = None,
+                   review: tuple | None = None):
+    """
+    Called with the user's lock held after every mutation of one bucket.
+    rep=(pos, li) when only that repetition counter changed,
+    review=(pos, li) when only that cell's review state changed.
+    """
+    global _dirty, _flush_task, _compact_task, _generation
+    _generation += 1
+    _versions[user_id] = _versions.get(user_id, 0) + 1
+    db = _sqlite()
+    if db is not None:
+        b = _state[user_id][lang][length]
+        if review is not None:
+            pos, li = review
+            db.upsert_review(user_id, lang, length, pos, li, b.get_review(pos, li))
+        elif rep is None:
+            db.upsert_run(user_id, lang, length, b.run_values())
+        else:
+            pos, li = rep
+            db.upsert_rep(user_id, lang, length, pos, li, b.get_rep(pos, li))
+        return
+    if _journal is not None:
+        b = _state[user_id][lang][length]
+        if review is not None:
+            pos, li = review
+            _journal.append(review_record(user_id, lang, length, pos, li, list(b.get_review(pos, li))))
+        elif rep is None:
+            _journal.append(run_record(user_id, lang, length, b.run_values()))
+        else:
+            pos, li = rep
+            _journal.append(rep_record(user_id, lang, length, pos, li, b.get_rep(pos, li)))
+        if _journal.size > journal_max_bytes() and (_compact_task is None or _compact_task.done()):
+            _compact_task = asyncio.get_running_loop().create_task(_compact())
+        return
+    if flush_interval() <= 0:
+        await _save_to_disk()
+        return
+    _dirty += 1
+    if _flush_task is None or _flush_task.done():
+        _flush_task = asyncio.get_running_loop().create_task(_flush_later())
+    if _dirty >= flush_max_dirty():
+        _flush_now.set()
+
+async def _compact():
+    """Fold the journal into a fresh snapshot (STATS_FILE) and start an empty journal."""
+    async with _WRITE_LOCK:
+        # snapshot + rotate without awaiting in between: the new journal starts exactly here
+        payload = _snapshot()
+        _journal.rotate()
+        try:
+            await asyncio.to_thread(_write_snapshot, payload)
+        except OSError as e:
+            # the rotated journal is kept: replayed on next start, appended to by the next compaction
+            print(f"[WARN] Could not compact stats journal into {stats_path()}: {e}")
+            return
+        _journal.drop_rotated()
+
+async def close():
+    """Stop the background flusher and write everything still pending (call on shutdown)."""
+    global _flush_task
+    if _compact_task is not None and not _compact_task.done():
+        await _compact_task
+    if _flush_task is not None and not _flush_task.done():
+        _flush_now.set()  # let the pending flush run right away instead of cancelling it mid-write
+        await _flush_task
+    _flush_task = None
+    await flush()
+    if _db is not None:
+        _db.close()
+    if _journal is not None:
+        _journal.close()
+
+_loaded = False
+
+def load() -> None:
+    """
+    Read the snapshot (and replay the journal) into memory; call once before the
+    API below is used. Blocking, and touches nothing else, so the bot runs it in a
+    worker thread during startup. sqlite loads each user lazily instead.
+    """
+    global _journal, _loaded
+    backend = stats_backend()
+    if _loaded or backend == "sqlite":
+        _loaded = True
+        return
+    _load_from_disk()
+    if backend == "journal":
+        _journal = StatsJournal(stats_journal_path())
+        for rec in _journal.replay():
+            _apply_record(rec)
+    _snapshot()  # fill the per-user cache here, so the first flush only converts what changed
+    _loaded = True
+
+# ---------- internal helpers ----------
+def _ensure_user(user_id: int):
+    db = _sqlite()
+    if db is None or user_id in _hydrated:
+        return
+    _hydrated.add(user_id)
+    for lang, lengths in db.load_user(user_id).items():
+        for length, leaf in lengths.items():
+            _state[user_id][lang][length].load(leaf)
+
+def _bucket(user_id: int, lang: str, length: int):
+    _ensure_user(user_id)
+    return _state[user_id][lang][length]
+
+# ---------- leaderboards ----------
+# Top LEADERBOARD_SIZE (env) records per (lang, length), sorted by (-record, updated_at, user_id).
+# Records only ever grow, so a user who drops off a board can only get back on through
+# their own record update, which goes through _leaderboard_update. A board is built on
+# first read (one scan of _state, or one indexed query for sqlite), then kept up to date
+# in O(K) per record change.
+def leaderboard_size() -> int:
+    return int(env("LEADERBOARD_SIZE", "10"))
+
+_boards: Dict[tuple, list] = {}
+
+def _board(lang: str, length: int) -> list:
+    board = _boards.get((lang, length))
+    if board is None:
+        db = _sqlite()
+        if db is not None:
+            rows = db.top_records(lang, length, leaderboard_size())
+        else:
+            rows = (
+                (langs[lang][length].record, langs[lang][length].record_updated_at, user_id)
+                for user_id, langs in _state.items()
+                if lang in langs and length in langs[lang]
+            )
+        board = heapq.nsmallest(
+            leaderboard_size(), ((-rec, ts, user_id) for rec, ts, user_id in rows if rec > 0)
+        )
+        _boards[(lang, length)] = board
+    return board
+
+def _leaderboard_update(user_id: int, lang: str, length: int, b: StatsLeaf):
+    board = _boards.get((lang, length))
+    if board is None:
+        return  # not built yet; the first read will see this record
+    for i, entry in enumerate(board):
+        if entry[2] == user_id:
+            del board[i]
+            break
+    bisect.insort(board, (-b.record, b.record_updated_at, user_id))
+    del board[leaderboard_size():]
+
+# ---------- spaced repetition (SM-2) ----------
+# Per (user, lang, length) two heaps: reviewed cells as (due, pos, li), and
+# never-reviewed cells as (reps, order, pos, li), least solved first, then walk
+# order. Reviewed cells that are due come before any new cell; new cells come
+# before reviews that aren't due yet. A review pushes the cell's new due time;
+# the entry it replaces goes stale and is dropped when it reaches the top (its
+# due no longer matches the leaf, or the "new" cell has been reviewed since), so
+# both peek and update stay O(log n). Heaps are kept for the REVIEW_HEAP_CACHE
+# most recently used (user, lang, length) and rebuilt from the leaf when needed.
+DEFAULT_EASE = 250   # x100
+MIN_EASE = 130
+DAY = 86400
+REVIEW_HEAP_CACHE = 1024
+_review_heaps: "OrderedDict[tuple, Tuple[list, list]]" = OrderedDict()
+
+def _review_heap(user_id: int, lang: str, length: int,
+                 cells: Optional[Iterable[Tuple[int, int]]]) -> Tuple[list, list]:
+    key = (user_id, lang, length)
+    heaps = _review_heaps.get(key)
+    if heaps is not None:
+        _review_heaps.move_to_end(key)
+    else:
+        b = _bucket(user_id, lang, length)
+        reviewed, new = [], []
+        for order, (pos, li) in enumerate(cells or ()):
+            review = b.get_review(pos, li)
+            if review is None:
+                new.append((b.get_rep(pos, li), order, pos, li))
+            else:
+                reviewed.append((review[0], pos, li))
+        heapq.heapify(reviewed)
+        heapq.heapify(new)
+        heaps = _review_heaps[key] = (reviewed, new)
+        if len(_review_heaps) > REVIEW_HEAP_CACHE:
+            _review_heaps.popitem(last=False)
+    return heaps
+
+def peek_review(user_id: int, lang: str, length: int,
+                cells: Optional[Iterable[Tuple[int, int]]] = None,
+                now: Optional[float] = None) -> Optional[Tuple[int, int, int, bool]]:
+    """
+    The next cell to review as (due, pos, li, reviewed_before): the most overdue
+    reviewed cell, else the next new cell (due 0), else the reviewed cell due
+    soonest (due in the future). `cells` (the hints that exist, in walk order)
+    is only read when the heaps have to be built: on first use, or after they
+    were evicted.
+    """
+    reviewed, new = _review_heap(user_id, lang, length, cells)
+    b = _bucket(user_id, lang, length)
+    while reviewed:
+        due, pos, li = reviewed[0]
+        review = b.get_review(pos, li)
+        if review is not None and review[0] == due:
+            break
+        heapq.heappop(reviewed)  # superseded by a later review
+    while new and b.get_review(new[0][2], new[0][3]) is not None:
+        heapq.heappop(new)  # reviewed since; it lives in the other heap now
+    now = time.time() if now is None else now
+    if reviewed and (reviewed[0][0] <= now or not new):
+        due, pos, li = reviewed[0]
+        return due, pos, li, True
+    if new:
+        _, _, pos, li = new[0]
+        return 0, pos, li, False
+    return None
+
+def _sm2(review: Optional[tuple], quality: int, now: int) -> Tuple[int, int, int, int]:
+    """Next (due, ease, interval, streak) after answering with quality 0..5."""
+    ease, interval, streak = (review[1], review[2], review[3]) if review else (DEFAULT_EASE, 0, 0)
+    if quality < 3:
+        streak, interval = 0, 1
+    else:
+        interval = 1 if streak == 0 else 6 if streak == 1 else max(1, round(interval * ease / 100))
+        streak += 1
+    ease = max(MIN_EASE, ease + 10 - (5 - quality) * (8 + (5 - quality) * 2))
+    return now + interval * DAY, ease, interval, streak
+
+# ---------- API (called by cogs) ----------
+async def start_run_if_at_beginning(user_id: int, lang: str, length: int,
+                                    start_pos: int, start_letter_idx: int,
+                                    record_eligible: bool):
+    """
+    Record eligibility depends ONLY on 'record_eligible' (i.e., no start_hint).
+    """
+    async with _user_lock(user_id):
+        b = _bucket(user_id, lang, length)
+        eligible = bool(record_eligible)
+        b.run_started = eligible
+        b.run_len = 0
+        b.count_record = eligible
+        await _persist(user_id, lang, length)
+
+async def advance_run_on_success(user_id: int, lang: str, length: int,
+                                 pos: int, li: int, iso: str,
+                                 alphabet_len: int, word_len: int):
+    async with _user_lock(user_id):
+        b = _bucket(user_id, lang, length)
+        b.run_len += 1
+        if b.count_record and b.run_len > b.record:
+            b.record = b.run_len
+            b.record_updated_at = iso
+            b.record_last_pos = pos
+            b.record_last_li  = li
+            _leaderboard_update(user_id, lang, length, b)
+        await _persist(user_id, lang, length)
+
+async def bump_repetition(user_id: int, lang: str, length: int,
+                          pos: int, li: int, iso: str):
+    async with _user_lock(user_id):
+        b = _bucket(user_id, lang, length)
+        b.bump(pos, li)  # 0-based pos and letter index
+        await _persist(user_id, lang, length, rep=(pos, li))
+
+# kept as a no-op (your UI doesn’t show completed counts anymore)
+async def mark_completed(user_id: int, lang: str, length: int,
+                         pos: int, li: int, iso: str):
+    return
+
+async def end_run(user_id: int, lang: str, length: int):
+    async with _user_lock(user_id):
+        b = _bucket(user_id, lang, length)
+        b.run_started = False
+        b.count_record = False
+        b.run_len = 0
+        await _persist(user_id, lang, length)
+
+async def record_review(user_id: int, lang: str, length: int,
+                        pos: int, li: int, quality: int, now: int | None = None):
+    """Schedule a cell's next review from how it went (SM-2 quality: 0 blackout .. 5 perfect)."""
+    now = int(time.time()) if now is None else now
+    async with _user_lock(user_id):
+        b = _bucket(user_id, lang, length)
+        values = _sm2(b.get_review(pos, li), quality, now)
+        b.set_review(pos, li, values)
+        heaps = _review_heaps.get((user_id, lang, length))
+        if heaps is not None:
+            heapq.heappush(heaps[0], (values[0], pos, li))
+        await _persist(user_id, lang, length, review=(pos, li))
+
+def get_stats_version(user_id: int) -> int:
+    """Changes whenever the user's stats change; no lock, no copying."""
+    return _versions.get(user_id, 0)
+
+async def get_stats(user_id: int) -> dict:
+    """
+    Returns:
+    {
+      "en": {
+        "3": {
+          "record": {"value": int, "updated_at": str, "last_pos": int|None, "last_li": int|None},
+          "reps":   [(pos, li, count), ...]   # 0-based, non-zero counters only
+        },
+        ...
+      },
+      "pl": { ... }
+    }
+    """
+    # Reading doesn't need the lock strictly; the user's lock orders it after their pending writes.
+    async with _user_lock(user_id):
+        _ensure_user(user_id)
+        user_data = _state.get(user_id, {})
+        if not user_data:
+            return {}
+        out = {}
+        for lang, lengths in user_data.items():
+            out[lang] = {}
+            for length, b in lengths.items():
+                out[lang][str(length)] = {
+                    "record": {
+                        "value": b.record,
+                        "updated_at": b.record_updated_at,
+                        "last_pos": b.record_last_pos,
+                        "last_li":  b.record_last_li,
+                    },
+                    "reps": list(b.iter_reps()),
+                }
+        return out
+
+async def get_leaderboard(lang: str, length: int) -> list:
+    """
+    Best records for one language/length, best first:
+    [{"user_id": int, "record": int, "updated_at": str}, ...]   (at most LEADERBOARD_SIZE)
+    """
+    return [
+        {"user_id": user_id, "record": -neg, "updated_at": ts}
+        for neg, ts, user_id in _board(lang, length)
+    ]
@@ -0,0 +1,221 @@
+from __future__ import annotations
+import asyncio
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from core.settings import env
+
+# ---------- per-round telemetry ----------
+# Every played round appends one row to two fixed-size rings: the player's ring
+# for (user, lang, length) and a global ring for (lang, length). A ring is a set
+# of parallel array columns (no per-row objects):
+#   cell   - pos * CELL_STRIDE + letter index
+#   first  - ms from the prompt to the first guess (NONE if nobody guessed)
+#   done   - ms from the prompt to completing the hint (NONE if it wasn't)
+#   wrong  - guesses that didn't credit anything
+#   timed  - 1 if time ran out
+# Columns grow as rows arrive, up to the ring's capacity; after that the oldest
+# rows are overwritten. Only the rows a ring holds are saved.
+
+# Settings are read from the environment on first use (see core.settings).
+
+def telemetry_path() -> Path:
+    return Path(env("TELEMETRY_FILE", "telemetry.bin")).resolve()
+
+def user_ring_size() -> int:
+    return int(env("TELEMETRY_USER_RING", "512"))
+
+def global_ring_size() -> int:
+    return int(env("TELEMETRY_GLOBAL_RING", "8192"))
+
+def save_every() -> int:
+    """Rounds between background saves."""
+    return int(env("TELEMETRY_SAVE_EVERY", "200"))
+
+NONE = 0xFFFFFFFF
+CELL_STRIDE = 64  # wider than any alphabet
+GLOBAL_USER = 0   # user id slot of the global rings in the file
+
+_COLUMNS = (("cell", "H"), ("first", "I"), ("done", "I"), ("wrong", "H"), ("timed", "B"))
+_MAGIC = b"GTBT"
+_VERSION = 2                              # 1 stored `capacity` rows per column, 2 stores `count`
+_HEADER = struct.Struct("<4sHI")          # magic, version, ring count
+_RING = struct.Struct("<q8sHIII")         # user_id, lang, length, capacity, head, count
+
+class Ring:
+    __slots__ = ("capacity", "head", "count") + tuple(name for name, _ in _COLUMNS)
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.head = 0   # next slot to write
+        self.count = 0  # rows held; the columns are this long
+        for name, code in _COLUMNS:
+            setattr(self, name, array(code))
+
+    def append(self, cell: int, first: int, done: int, wrong: int, timed: bool) -> None:
+        wrong = min(wrong, 0xFFFF)
+        timed = 1 if timed else 0
+        if self.count < self.capacity:
+            # still growing: head == count, so the new row goes on the end
+            self.cell.append(cell)
+            self.first.append(first)
+            self.done.append(done)
+            self.wrong.append(wrong)
+            self.timed.append(timed)
+            self.count += 1
+            self.head = self.count % self.capacity
+            return
+        i = self.head
+        self.cell[i] = cell
+        self.first[i] = first
+        self.done[i] = done
+        self.wrong[i] = wrong
+        self.timed[i] = timed
+        self.head = (i + 1) % self.capacity
+
+    def rows(self, cell: Optional[int] = None) -> Iterator[Tuple[int, int, int, int, int]]:
+        """(cell, first, done, wrong, timed), oldest first, optionally for one cell only."""
+        if not self.count:
+            return
+        start = (self.head - self.count) % self.count
+        for k in range(self.count):
+            i = (start + k) % self.count
+            if cell is None or self.cell[i] == cell:
+                yield self.cell[i], self.first[i], self.done[i], self.wrong[i], self.timed[i]
+
+_user_rings: Dict[Tuple[int, str, int], Ring] = {}
+_global_rings: Dict[Tuple[str, int], Ring] = {}
+_unsaved = 0
+_save_task: Optional[asyncio.Task] = None
+
+def cell_key(pos: int, li: int) -> int:
+    return pos * CELL_STRIDE + li
+
+def _ms(seconds: Optional[float]) -> int:
+    return NONE if seconds is None else min(int(seconds * 1000), NONE - 1)
+
+def record(user_id: int, lang: str, length: int, pos: int, li: int,
+           first_guess: Optional[float], completed: Optional[float], wrong: int, timed_out: bool) -> None:
+    """One finished round. Times are seconds from the prompt (None: didn't happen)."""
+    global _unsaved, _save_task
+    row = (cell_key(pos, li), _ms(first_guess), _ms(completed), wrong, timed_out)
+    ring = _user_rings.get((user_id, lang, length))
+    if ring is None:
+        ring = _user_rings[(user_id, lang, length)] = Ring(user_ring_size())
+    ring.append(*row)
+    ring = _global_rings.get((lang, length))
+    if ring is None:
+        ring = _global_rings[(lang, length)] = Ring(global_ring_size())
+    ring.append(*row)
+    _unsaved += 1
+    if _unsaved >= save_every() and (_save_task is None or _save_task.done()):
+        _save_task = asyncio.get_running_loop().create_task(save())
+
+def user_ring(user_id: int, lang: str, length: int) -> Optional[Ring]:
+    return _user_rings.get((user_id, lang, length))
+
+def global_ring(lang: str, length: int) -> Optional[Ring]:
+    return _global_rings.get((lang, length))
+
+def user_lengths(user_id: int) -> List[Tuple[str, int]]:
+    return sorted((lang, length) for uid, lang, length in _user_rings if uid == user_id)
+
+def percentile(values: List[int], p: float) -> Optional[int]:
+    """Nearest-rank percentile (p in 0..100) of unsorted values; None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, -(-len(ordered) * p // 100) - 1))
+    return ordered[int(k)]
+
+def summary(ring: Ring, cell: Optional[int] = None) -> dict:
+    """Counts, p50/p90 times (ms) and wrong guesses per round over a ring (or one cell of it)."""
+    rounds = solved = wrong = timeouts = 0
+    firsts: List[int] = []
+    dones: List[int] = []
+    for _, first, done, w, timed in ring.rows(cell):
+        rounds += 1
+        wrong += w
+        timeouts += timed
+        if first != NONE:
+            firsts.append(first)
+        if done != NONE:
+            dones.append(done)
+            solved += 1
+    return {
+        "rounds": rounds,
+        "solved": solved,
+        "timeouts": timeouts,
+        "wrong_per_round": wrong / rounds if rounds else 0.0,
+        "first_p50": percentile(firsts, 50), "first_p90": percentile(firsts, 90),
+        "done_p50": percentile(dones, 50), "done_p90": percentile(dones, 90),
+    }
+
+# ---------- persistence ----------
+
+def _encode() -> bytes:
+    rings = [((uid, lang, length), r) for (uid, lang, length), r in _user_rings.items()]
+    rings += [((GLOBAL_USER, lang, length), r) for (lang, length), r in _global_rings.items()]
+    parts = [_HEADER.pack(_MAGIC, _VERSION, len(rings))]
+    for (uid, lang, length), r in rings:
+        parts.append(_RING.pack(uid, lang.encode("ascii")[:8], length, r.capacity, r.head, r.count))
+        parts.extend(getattr(r, name).tobytes() for name, _ in _COLUMNS)
+    return b"".join(parts)
+
+def _write(blob: bytes) -> None:
+    path = telemetry_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, path)
+
+async def save() -> None:
+    """Write every ring (encoded on the loop, written in a thread)."""
+    global _unsaved
+    if not _unsaved:
+        return
+    blob, _unsaved = _encode(), 0
+    try:
+        await asyncio.to_thread(_write, blob)
+    except OSError as e:
+        print(f"[WARN] Could not save telemetry to {telemetry_path()}: {e}")
+
+def load() -> None:
+    """Read the rings saved by a previous run (blocking; startup runs it in a worker thread)."""
+    try:
+        data = telemetry_path().read_bytes()
+    except OSError:
+        return
+    try:
+        magic, version, n = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version not in (1, _VERSION):
+            return
+        off = _HEADER.size
+        for _ in range(n):
+            uid, lang, length, capacity, head, count = _RING.unpack_from(data, off)
+            off += _RING.size
+            if count > capacity or (count < capacity and head != count % capacity):
+                raise ValueError("inconsistent ring header")
+            stored = capacity if version == 1 else count
+            r = Ring(capacity)
+            r.head, r.count = head, count
+            for name, code in _COLUMNS:
+                col = getattr(r, name)
+                size = col.itemsize * stored
+                col.frombytes(data[off:off + size])
+                off += size
+                if len(col) < stored:
+                    raise ValueError("truncated ring")
+                del col[count:]
+            lang = lang.rstrip(b"\0").decode("ascii")
+            if uid == GLOBAL_USER:
+                _global_rings[(lang, length)] = r
+            else:
+                _user_rings[(uid, lang, length)] = r
+    except (struct.error, ValueError, UnicodeDecodeError):
+        # truncated or corrupt file: start fresh rather than half-loaded
+        _user_rings.clear()
+        _global_rings.clear()
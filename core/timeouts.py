@@ -0,0 +1,115 @@
+from __future__ import annotations
+import math
+from collections import OrderedDict, deque
+from typing import Deque, Optional, Tuple
+
+from core import telemetry
+from core.hint_atlas import HintCell
+from core.settings import env
+
+# ---------- adaptive hint timeouts ----------
+# A hint's time limit comes from how long it has actually taken to solve: the
+# ADAPT_PERCENTILE completion time over the last ADAPT_WINDOW rounds of that
+# cell, times ADAPT_MARGIN, plus ADAPT_PAD seconds to read the prompt. The
+# player's own rounds are used once there are ADAPT_MIN_ROUNDS of them, else
+# everyone's, else the old fixed rule. Rounds that timed out count as "slower
+# than anything": when they reach the percentile, the limit is set above both
+# the fixed rule and the slowest recent solve instead.
+#
+# Each (lang, length, pos, letter) entry is built once from the telemetry rings
+# and then updated in place by observe() as rounds finish. Only the
+# TIMES_CACHE_SIZE most recently used entries are kept; an evicted one is simply
+# rebuilt from telemetry, which has every round observe() saw.
+
+class _Adapt:
+    """The ADAPT_* settings, read from the environment on first use (see core.settings)."""
+    __slots__ = ("percentile", "margin", "pad", "min_rounds", "window")
+
+    def __init__(self):
+        self.percentile = float(env("ADAPT_PERCENTILE", "90"))
+        self.margin = float(env("ADAPT_MARGIN", "1.25"))
+        self.pad = float(env("ADAPT_PAD", "3"))
+        self.min_rounds = int(env("ADAPT_MIN_ROUNDS", "5"))
+        self.window = int(env("ADAPT_WINDOW", "32"))
+
+_adapt: Optional[_Adapt] = None
+
+def adapt_settings() -> _Adapt:
+    global _adapt
+    if _adapt is None:
+        _adapt = _Adapt()
+    return _adapt
+
+ADAPT_GROWTH = 1.5   # limit multiplier when too many recent rounds timed out
+MIN_TIMEOUT = 8
+MAX_TIMEOUT = 180
+TIMES_CACHE_SIZE = 16384
+
+def default_timeout(cell: HintCell) -> int:
+    """The fixed rule, for hints nobody has played enough yet."""
+    return 10 + 3 * len(cell["matches"])
+
+class CellTimes:
+    __slots__ = ("done", "timeout")
+
+    def __init__(self):
+        self.done: Deque[int] = deque(maxlen=adapt_settings().window)  # ms to complete, telemetry.NONE if timed out
+        self.timeout: Optional[int] = None  # cached; None until enough rounds
+
+    def add(self, done_ms: int, fallback: int) -> None:
+        self.done.append(done_ms)
+        self.refresh(fallback)
+
+    def refresh(self, fallback: int) -> None:
+        adapt = adapt_settings()
+        if len(self.done) < adapt.min_rounds:
+            self.timeout = None
+            return
+        p = telemetry.percentile(list(self.done), adapt.percentile)
+        if p == telemetry.NONE:
+            slowest = max((d for d in self.done if d != telemetry.NONE), default=0)
+            limit = max(fallback, slowest / 1000 * adapt.margin + adapt.pad) * ADAPT_GROWTH
+        else:
+            limit = p / 1000 * adapt.margin + adapt.pad
+        self.timeout = max(MIN_TIMEOUT, min(MAX_TIMEOUT, math.ceil(limit)))
+
+Key = Tuple[int, str, int, int, int]  # (user id or GLOBAL_USER, lang, length, pos, li)
+_cache: "OrderedDict[Key, CellTimes]" = OrderedDict()
+
+def _entry(user_id: int, lang: str, length: int, cell: HintCell) -> CellTimes:
+    key = (user_id, lang, length, cell["pos"], cell["li"])
+    entry = _cache.get(key)
+    if entry is not None:
+        _cache.move_to_end(key)
+    else:
+        entry = _cache[key] = CellTimes()
+        if len(_cache) > TIMES_CACHE_SIZE:
+            _cache.popitem(last=False)
+        ring = (telemetry.global_ring(lang, length) if user_id == telemetry.GLOBAL_USER
+                else telemetry.user_ring(user_id, lang, length))
+        if ring is not None:
+            entry.done.extend(done for _, _, done, _, _ in ring.rows(telemetry.cell_key(cell["pos"], cell["li"])))
+            entry.refresh(default_timeout(cell))
+    return entry
+
+def hint_timeout(lang: str, cell: HintCell, user_id: Optional[int] = None) -> int:
+    """Seconds to allow for `cell`, for `user_id` if they have enough history on it."""
+    length = len(cell["raw_hint"])
+    if user_id is not None:
+        timeout = _entry(user_id, lang, length, cell).timeout
+        if timeout is not None:
+            return timeout
+    timeout = _entry(telemetry.GLOBAL_USER, lang, length, cell).timeout
+    return default_timeout(cell) if timeout is None else timeout
+
+def observe(user_id: int, lang: str, cell: HintCell, completed: Optional[float]) -> None:
+    """
+    One finished round (completed: seconds, None if it timed out). Only entries
+    already built are updated; the rest pick the round up from telemetry later.
+    """
+    length = len(cell["raw_hint"])
+    done = telemetry.NONE if completed is None else min(int(completed * 1000), telemetry.NONE - 1)
+    for uid in (user_id, telemetry.GLOBAL_USER):
+        entry = _cache.get((uid, lang, length, cell["pos"], cell["li"]))
+        if entry is not None:
+            entry.add(done, default_timeout(cell))
@@ -0,0 +1,250 @@
+from __future__ import annotations
+import bisect
+import json
+import os
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, TypedDict
+from core import settings
+from core.hint_utils import HintIndex
+from core.word_store import read_store, write_store
+
+class EnEntry(TypedDict):
+    id: int          # position in Words.lists["normal"]
+    english: str
+
+class PlEntry(TypedDict):
+    id: int          # position in Words.polish
+    polish: str
+    english: str
+
+# normalized answer -> ids of every entry that accepts it (one shared index per language);
+# a store loaded from words.bin has a word_store.MappedIndex instead, with the same get()
+AnswerIndex = Dict[str, array]
+
+EN_ALPHABET = [chr(ord('a') + i) for i in range(26)]
+POLISH_ALPHABET = [
+    "a", "ą", "b", "c", "ć", "d", "e", "ę", "f", "g", "h", "i", "j", "k",
+    "l", "ł", "m", "n", "ń", "o", "ó", "p", "q", "r", "s", "ś", "t", "u",
+    "v", "w", "x", "y", "z", "ź", "ż"
+]
+
+# ---------- NEW: ASCII folding for Polish diacritics ----------
+PL_ASCII_MAP = str.maketrans({
+    "ą": "a", "Ą": "a",
+    "ć": "c", "Ć": "c",
+    "ę": "e", "Ę": "e",
+    "ł": "l", "Ł": "l",
+    "ń": "n", "Ń": "n",
+    "ó": "o", "Ó": "o",
+    "ś": "s", "Ś": "s",
+    "ź": "z", "Ź": "z",
+    "ż": "z", "Ż": "z",
+})
+
+def ascii_fold(s: str) -> str:
+    """Translate Polish diacritics to ASCII equivalents."""
+    return s.translate(PL_ASCII_MAP)
+
+def gen_variants(s: str) -> Set[str]:
+    """
+    Given a phrase, generate acceptable variants:
+    - lowercase
+    - lowercase with spaces removed
+    - ASCII-folded
+    - ASCII-folded with spaces removed
+    """
+    s_low = s.lower()
+    s_low_nospace = s_low.replace(" ", "")
+    s_fold = ascii_fold(s_low)
+    s_fold_nospace = s_fold.replace(" ", "")
+    return {s_low, s_low_nospace, s_fold, s_fold_nospace}
+# -------------------------------------------------------------
+
+def normalize_answer(s: str) -> str:
+    """How guesses and accepted answers are compared."""
+    return s.strip().lower()
+
+def build_answer_index(answer_sets: Iterable[Set[str]]) -> AnswerIndex:
+    """
+    answer_sets yields the accepted answers of entry id 0, 1, 2, ...
+    Keys are normalized and interned; values are compact u32 id arrays.
+    """
+    index: AnswerIndex = {}
+    intern = sys.intern
+    for eid, answers in enumerate(answer_sets):
+        for a in {normalize_answer(a) for a in answers}:
+            if not a:
+                continue
+            ids = index.get(a)
+            if ids is None:
+                index[intern(a)] = array("I", (eid,))
+            else:
+                ids.append(eid)
+    return index
+
+def _difficulty(length: int) -> int:
+    """0 = easy, 1 = medium, 2 = hard (also the order of lists["normal"])."""
+    if 3 <= length <= 5:
+        return 0
+    if 6 <= length <= 8:
+        return 1
+    return 2
+
+def split_by_difficulty(entries: Sequence[EnEntry]) -> Dict[str, Sequence[EnEntry]]:
+    """
+    Buckets of entries that are already in difficulty order (as lists["normal"]
+    always is). They are slices found by binary search, so a mapped store
+    isn't decoded to split it.
+    """
+    def key(e: EnEntry) -> int:
+        return _difficulty(len(e["english"]))
+    easy_end = bisect.bisect_left(entries, 1, key=key)
+    medium_end = bisect.bisect_left(entries, 2, lo=easy_end, key=key)
+    return {
+        "easy": entries[:easy_end], "medium": entries[easy_end:medium_end],
+        "hard": entries[medium_end:], "normal": entries,
+    }
+
+def load_word_lists_from_json(file_path: str) -> Tuple[Dict[str, Sequence[EnEntry]], AnswerIndex]:
+    with open(file_path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    themes: List[Tuple[str, Set[str]]] = []
+    for entry in raw:
+        bot_word: str = entry["theme"]
+
+        valid: Set[str] = set()
+        # English theme itself + variants (also covers any diacritics if present)
+        valid |= gen_variants(bot_word)
+
+        # translations (any language): accept their variants too
+        for t in entry.get("translations", {}).values():
+            tr = t.get("translation")
+            if tr:
+                valid |= gen_variants(tr)
+
+        # shortcut
+        sc = entry.get("shortcut")
+        if sc:
+            valid |= gen_variants(sc)
+
+        # multiwords
+        for mw in entry.get("multiwords", []):
+            m = mw.get("multiword")
+            if m:
+                valid |= gen_variants(m)
+
+        themes.append((bot_word, valid))
+
+    # stable sort into lists["normal"] order so ids are positions in it
+    themes.sort(key=lambda t: _difficulty(len(t[0])))
+    entries: List[EnEntry] = [{"id": i, "english": w} for i, (w, _) in enumerate(themes)]
+    return split_by_difficulty(entries), build_answer_index(a for _, a in themes)
+
+def load_word_lists_from_json_polish(file_path: str) -> Tuple[List[PlEntry], AnswerIndex]:
+    with open(file_path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    out: List[PlEntry] = []
+    answer_sets: List[Set[str]] = []
+    for entry in raw:
+        pl = entry.get("translations", {}).get("pl", {}).get("translation")
+        if not pl:
+            continue
+        pl = pl.strip()
+        en = entry.get("theme", "")
+
+        valid: Set[str] = set()
+        # Polish word + variants (adds ascii-folded forms like 'zolc' for 'żółć')
+        valid |= gen_variants(pl)
+
+        # Allow English theme as a valid guess (and variants)
+        if en:
+            valid |= gen_variants(en)
+
+        # shortcut
+        sc = entry.get("shortcut")
+        if sc:
+            valid |= gen_variants(sc)
+
+        # multiwords
+        for mw in entry.get("multiwords", []):
+            m = mw.get("multiword")
+            if m:
+                valid |= gen_variants(m)
+
+        out.append({"id": len(out), "polish": pl, "english": en})
+        answer_sets.append(valid)
+    return out, build_answer_index(answer_sets)
+
+def words_fingerprint(file_path: Optional[str] = None) -> Tuple[int, int]:
+    """(mtime_ns, size) of the words file; cheap change detection without reading it."""
+    st = os.stat(file_path or settings.words_json())
+    return st.st_mtime_ns, st.st_size
+
+def compile_words(file_path: Optional[str] = None, bin_path: Optional[str] = None) -> str:
+    """Parse words.json and write the compiled store next to it; returns the store path."""
+    file_path = file_path or settings.words_json()
+    bin_path = bin_path or settings.words_bin()
+    fingerprint = words_fingerprint(file_path)
+    lists, en_index = load_word_lists_from_json(file_path)
+    polish, pl_index = load_word_lists_from_json_polish(file_path)
+    write_store(bin_path, fingerprint, lists["normal"], en_index, polish, pl_index)
+    return bin_path
+
+def _load_all(file_path: Optional[str] = None, bin_path: Optional[str] = None):
+    """
+    Prefer the compiled store; fall back to parsing JSON (and refresh the store)
+    when it's missing or built from a different words.json.
+    """
+    file_path = file_path or settings.words_json()
+    bin_path = bin_path or settings.words_bin()
+    fingerprint = words_fingerprint(file_path)
+    compiled = read_store(bin_path, fingerprint)
+    if compiled is not None:
+        en, en_index, polish, pl_index = compiled
+        return split_by_difficulty(en), en_index, polish, pl_index, fingerprint
+
+    lists, en_index = load_word_lists_from_json(file_path)
+    polish, pl_index = load_word_lists_from_json_polish(file_path)
+    try:
+        write_store(bin_path, fingerprint, lists["normal"], en_index, polish, pl_index)
+    except OSError as e:
+        print(f"[WARN] Could not write compiled word store {bin_path}: {e}")
+    else:
+        # serve from the fresh store too, so the parsed objects can be dropped
+        compiled = read_store(bin_path, fingerprint)
+        if compiled is not None:
+            en, en_index, polish, pl_index = compiled
+            return split_by_difficulty(en), en_index, polish, pl_index, fingerprint
+    return lists, en_index, polish, pl_index, fingerprint
+
+DIFFICULTIES = ("easy", "medium", "hard", "normal")  # keys of Words.lists
+
+class Words:
+    """
+    One load of words.json: the entries, the answer indexes and the positional
+    hint indexes (word ids are positions in lists["normal"] / polish). Never
+    modified once built; a reload makes a new one, so whatever holds on to it
+    keeps resolving guesses against the data it started with.
+    """
+    __slots__ = ("lists", "en_answer_index", "polish", "pl_answer_index",
+                 "fingerprint", "en_hint_index", "pl_hint_index")
+
+    def __init__(self, lists: Dict[str, Sequence[EnEntry]], en_answer_index: AnswerIndex,
+                 polish: Sequence[PlEntry], pl_answer_index: AnswerIndex,
+                 fingerprint: Optional[Tuple[int, int]]):
+        self.lists = lists
+        self.en_answer_index = en_answer_index
+        self.polish = polish
+        self.pl_answer_index = pl_answer_index
+        self.fingerprint = fingerprint  # None for the empty set
+        self.en_hint_index = HintIndex([e["english"] for e in lists["normal"]])
+        self.pl_hint_index = HintIndex([e["polish"] for e in polish])
+
+EMPTY = Words(split_by_difficulty([]), {}, [], {}, None)
+
+def load_words(file_path: Optional[str] = None, bin_path: Optional[str] = None) -> Words:
+    """Read words.json (or its compiled store) into a new Words. Blocking."""
+    return Words(*_load_all(file_path, bin_path))
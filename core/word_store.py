@@ -0,0 +1,242 @@
+from __future__ import annotations
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+# ---------- compiled word store ----------
+# Binary snapshot of the parsed word lists so startup doesn't re-parse words.json
+# and re-run gen_variants over every theme. Layout (native byte order, u32 = array('I')):
+#
+#   header   MAGIC, VERSION, byteorder, source (mtime_ns, size), section counts
+#   strings  u32 offsets[n_strings + 1] + utf-8 blob   (every distinct string once, padded to 4)
+#   en       u32 english[n_en]
+#            answer index: u32 keys[n_keys], u32 start[n_keys + 1], u32 ids[...]
+#   pl       u32 polish[n_pl], u32 english[n_pl]
+#            answer index: u32 keys[n_keys], u32 start[n_keys + 1], u32 ids[...]
+#
+# Words and answers are ids into the string table, so every string is stored
+# once. Index keys are sorted by their utf-8 bytes. Reading the store decodes
+# nothing up front: entries are built when they're accessed and answers are
+# found by binary search over the mapped keys, so what stays resident is the
+# mapping (shared with the page cache) rather than a Python object per entry
+# and per accepted answer. The file is stale as soon as the source fingerprint
+# or VERSION differs; callers then fall back to JSON and recompile.
+
+MAGIC = b"GTBW"
+VERSION = 3
+_HEADER = struct.Struct("<4sHBxqq")
+_COUNTS = struct.Struct("<IIIIIIII")
+_BYTEORDER = 0 if sys.byteorder == "little" else 1
+
+Fingerprint = Tuple[int, int]
+AnswerIndex = Dict[str, array]
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def add(self, s: str) -> int:
+        sid = self.ids.get(s)
+        if sid is None:
+            sid = self.ids[s] = len(self.strings)
+            self.strings.append(s)
+        return sid
+
+def _u32(values: Sequence[int]) -> bytes:
+    return array("I", values).tobytes()
+
+def _flatten_index(table: _StringTable, index: AnswerIndex) -> Tuple[array, array, array]:
+    keys, start, ids = array("I"), array("I", (0,)), array("I")
+    for answer, eids in sorted(index.items(), key=lambda kv: kv[0].encode("utf-8")):
+        keys.append(table.add(answer))
+        ids.extend(eids)
+        start.append(len(ids))
+    return keys, start, ids
+
+def write_store(path: str, fingerprint: Fingerprint,
+                en_entries: List[dict], en_index: AnswerIndex,
+                pl_entries: List[dict], pl_index: AnswerIndex) -> None:
+    """Serialize parsed entries and answer indexes (as built by word_loader) to 'path' atomically."""
+    table = _StringTable()
+    en_word = [table.add(e["english"]) for e in en_entries]
+    pl_word = [table.add(e["polish"]) for e in pl_entries]
+    pl_eng = [table.add(e["english"]) for e in pl_entries]
+    en_keys, en_start, en_ids = _flatten_index(table, en_index)
+    pl_keys, pl_start, pl_ids = _flatten_index(table, pl_index)
+
+    offsets, chunks, pos = [0], [], 0
+    for s in table.strings:
+        b = s.encode("utf-8")
+        chunks.append(b)
+        pos += len(b)
+        offsets.append(pos)
+    blob = b"".join(chunks)
+    blob += b"\0" * (-len(blob) % 4)  # keep the u32 sections aligned
+
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, _BYTEORDER, fingerprint[0], fingerprint[1]),
+        _COUNTS.pack(len(table.strings), pos, len(en_word), len(en_keys), len(en_ids),
+                     len(pl_word), len(pl_keys), len(pl_ids)),
+        _u32(offsets), blob,
+        _u32(en_word), en_keys.tobytes(), en_start.tobytes(), en_ids.tobytes(),
+        _u32(pl_word), _u32(pl_eng), pl_keys.tobytes(), pl_start.tobytes(), pl_ids.tobytes(),
+    ]
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(out.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        for p in parts:
+            f.write(p)
+    os.replace(tmp, out)
+
+class _Strings:
+    """The string table, decoded on access."""
+    __slots__ = ("_offsets", "_blob")
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def raw(self, sid: int) -> bytes:
+        return self._blob[self._offsets[sid]:self._offsets[sid + 1]].tobytes()
+
+    def __getitem__(self, sid: int) -> str:
+        return str(self.raw(sid), "utf-8")
+
+class MappedEntries(Sequence):
+    """
+    Entries (or a contiguous slice of them) built on access from the mapped
+    columns; entry["id"] stays the position in the full list.
+    """
+    __slots__ = ("_strings", "_fields", "_columns", "_start", "_stop")
+
+    def __init__(self, strings: _Strings, fields: Sequence[str], columns: Sequence[memoryview],
+                 start: int = 0, stop: Optional[int] = None):
+        self._strings = strings
+        self._fields = fields
+        self._columns = columns
+        self._start = start
+        self._stop = len(columns[0]) if stop is None else stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, i: Union[int, slice]):
+        n = self._stop - self._start
+        if isinstance(i, slice):
+            lo, hi, step = i.indices(n)
+            if step != 1:
+                return [self[k] for k in range(lo, hi, step)]
+            return MappedEntries(self._strings, self._fields, self._columns,
+                                 self._start + lo, self._start + max(lo, hi))
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("entry index out of range")
+        eid = self._start + i
+        entry = {"id": eid}
+        for name, col in zip(self._fields, self._columns):
+            entry[name] = self._strings[col[eid]]
+        return entry
+
+class MappedIndex:
+    """Answer index over the mapped store: binary search on the sorted keys."""
+    __slots__ = ("_strings", "_keys", "_start", "_ids")
+
+    def __init__(self, strings: _Strings, keys: memoryview, start: memoryview, ids: memoryview):
+        self._strings = strings
+        self._keys = keys
+        self._start = start
+        self._ids = ids
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _find(self, answer: str) -> int:
+        target = answer.encode("utf-8")
+        raw, keys = self._strings.raw, self._keys
+        lo, hi = 0, len(keys)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if raw(keys[mid]) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < len(keys) and raw(keys[lo]) == target else -1
+
+    def get(self, answer: str, default=None):
+        k = self._find(answer)
+        if k < 0:
+            return default
+        return array("I", self._ids[self._start[k]:self._start[k + 1]])
+
+    def __contains__(self, answer: str) -> bool:
+        return self._find(answer) >= 0
+
+def read_store(path: str, fingerprint: Fingerprint
+               ) -> Optional[Tuple[MappedEntries, MappedIndex, MappedEntries, MappedIndex]]:
+    """
+    Map the compiled store and return (english entries, english answer index,
+    polish entries, polish answer index), all reading from the mapping. Returns
+    None if the file is missing, malformed, from another version/byte order, or
+    built from a different words.json. The mapping stays open for as long as
+    any of the four is referenced (the file is only ever replaced, never rewritten).
+    """
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return None
+    with f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return None
+    try:
+        magic, version, order, mtime_ns, size = _HEADER.unpack_from(mm, 0)
+        if (magic != MAGIC or version != VERSION or order != _BYTEORDER
+                or (mtime_ns, size) != tuple(fingerprint)):
+            mm.close()
+            return None
+        (n_str, blob_len, n_en, n_en_keys, n_en_ids,
+         n_pl, n_pl_keys, n_pl_ids) = _COUNTS.unpack_from(mm, _HEADER.size)
+        expected = (_HEADER.size + _COUNTS.size + 4 * (n_str + 1) + blob_len + (-blob_len % 4)
+                    + 4 * (n_en + 2 * n_en_keys + 1 + n_en_ids)
+                    + 4 * (2 * n_pl + 2 * n_pl_keys + 1 + n_pl_ids))
+        if expected != len(mm):
+            mm.close()
+            return None
+    except struct.error:
+        mm.close()
+        return None
+
+    view = memoryview(mm)
+    pos = _HEADER.size + _COUNTS.size
+
+    def take_u32(n: int) -> memoryview:
+        nonlocal pos
+        mv = view[pos:pos + 4 * n].cast("I")
+        pos += 4 * n
+        return mv
+
+    offsets = take_u32(n_str + 1)
+    blob = view[pos:pos + blob_len]
+    pos += blob_len + (-blob_len % 4)
+    strings = _Strings(offsets, blob)
+
+    en_word = take_u32(n_en)
+    en_index = MappedIndex(strings, take_u32(n_en_keys), take_u32(n_en_keys + 1), take_u32(n_en_ids))
+    pl_word, pl_eng = take_u32(n_pl), take_u32(n_pl)
+    pl_index = MappedIndex(strings, take_u32(n_pl_keys), take_u32(n_pl_keys + 1), take_u32(n_pl_ids))
+    en_entries = MappedEntries(strings, ("english",), (en_word,))
+    pl_entries = MappedEntries(strings, ("polish", "english"), (pl_word, pl_eng))
+    return en_entries, en_index, pl_entries, pl_index
+
+if __name__ == "__main__":
+    # python -m core.word_store  -> (re)compile WORDS_BIN from WORDS_JSON
+    from core.word_loader import compile_words
+    print(f"✅ Compiled word store: {compile_words()}")
@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+
+# Every file the bot would touch goes to a throwaway directory. Settings are read
+# on first use, so tests can also change them with monkeypatch.setenv.
+_TMP = tempfile.mkdtemp(prefix="gtw-tests-")
+os.environ.setdefault("DISCORD_TOKEN", "test")
+os.environ["STATS_FILE"] = os.path.join(_TMP, "stats.json")
+os.environ["TELEMETRY_FILE"] = os.path.join(_TMP, "telemetry.bin")
+os.environ["WORDS_JSON"] = os.path.join(_TMP, "words.json")
+os.environ["WORDS_BIN"] = os.path.join(_TMP, "words.bin")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
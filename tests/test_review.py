@@ -0,0 +1,43 @@
+import asyncio
+import json
+import os
+import string
+import time
+
+import pytest
+
+from core import hint_atlas, stats_store
+from core.game import REVIEW_NEW_LIMIT, review_rounds
+
+def _write_words():
+    # 26 rotations of the alphabet: every letter at every position of a 5-letter word
+    letters = string.ascii_lowercase
+    words = [(letters * 2)[i:i + 5] for i in range(26)]
+    with open(os.environ["WORDS_JSON"], "w", encoding="utf-8") as f:
+        json.dump([{"theme": w} for w in words], f)
+    hint_atlas.load()
+
+@pytest.mark.parametrize("heap_cache", [stats_store.REVIEW_HEAP_CACHE, 0])
+def test_due_reviews_come_before_new_cells(monkeypatch, heap_cache):
+    # heap_cache=0 evicts the heaps after every peek, so each one is rebuilt mid-session
+    monkeypatch.setattr(stats_store, "REVIEW_HEAP_CACHE", heap_cache)
+    _write_words()
+    user_id = 9001 + heap_cache
+    cells = hint_atlas.get_cells("en", 5)
+    assert len(cells) > REVIEW_NEW_LIMIT + 3
+    overdue = [(c["pos"], c["li"]) for c in cells[-3:]]  # last in walk order
+
+    async def main():
+        long_ago = int(time.time()) - 30 * stats_store.DAY
+        for pos, li in overdue:
+            await stats_store.record_review(user_id, "en", 5, pos, li, 5, now=long_ago)
+        served = []
+        for rnd in review_rounds("en", 5, user_id):
+            served.append(((rnd.pos, rnd.li), "(new)" in rnd.prompts[0]))
+            await stats_store.record_review(user_id, "en", 5, rnd.pos, rnd.li, 4)
+        return served
+
+    served = asyncio.run(main())
+    assert [cell for cell, _ in served[:3]] == overdue
+    assert not any(is_new for _, is_new in served[:3])
+    assert [is_new for _, is_new in served[3:]] == [True] * REVIEW_NEW_LIMIT
@@ -0,0 +1,61 @@
+import asyncio
+import itertools
+from types import SimpleNamespace
+
+from core.game import Answers, Mode, Round
+from utils import guess_router
+from utils.sessions import start_session, stop_session
+
+_ids = itertools.count(1)
+
+class FakeMessage:
+    def __init__(self, channel, content):
+        self.id = next(_ids)
+        self.channel = channel
+        self.content = content
+
+    async def edit(self, content=None):
+        self.content = content
+        return self
+
+    async def delete(self):
+        pass
+
+class FakeChannel:
+    def __init__(self):
+        self.id = next(_ids)
+        self.sent = []
+        self.prompted = asyncio.Event()
+
+    async def send(self, content):
+        self.sent.append(content)
+        self.prompted.set()
+        return FakeMessage(self, content)
+
+class NeverSolved(Answers):
+    def __init__(self, target):
+        self.wrong = 0
+
+    def credit(self, guess):
+        self.wrong += 1
+        return None
+
+    def miss_text(self):
+        return "missed"
+
+def test_stop_in_same_tick_as_guess():
+    async def main():
+        channel = FakeChannel()
+        mode = Mode("test", rounds=iter([Round("a____", ["prompt"], 30, None)]), answers=NeverSolved)
+        session = await start_session(channel, mode, owner_id=1)
+        await channel.prompted.wait()
+        for _ in range(5):
+            await asyncio.sleep(0)  # let the session block on the next guess
+        message = SimpleNamespace(channel=SimpleNamespace(id=channel.id), author=SimpleNamespace(mention="@p"))
+        assert guess_router.dispatch(message, "guess")
+        # same tick: the guess wakes the waiting getter, then the stop cancels the session
+        assert await asyncio.wait_for(stop_session(channel.id), 2)
+        assert session.task.done()
+        assert session.stopped
+
+    asyncio.run(main())
@@ -0,0 +1,14 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_importing_the_core_reads_no_settings():
+    code = (
+        "import sys, core.game, core.timeouts, core.stats_store, core.telemetry\n"
+        "from core import settings\n"
+        "assert not settings._dotenv_loaded\n"
+        "assert 'dotenv' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
@@ -0,0 +1,75 @@
+import asyncio
+import json
+import threading
+
+from core import stats_store
+
+def _fresh_flusher(monkeypatch, interval):
+    # loop-bound primitives from earlier asyncio.run() calls can't be reused
+    monkeypatch.setenv("STATS_FLUSH_INTERVAL", str(interval))
+    monkeypatch.setattr(stats_store, "_WRITE_LOCK", asyncio.Lock())
+    monkeypatch.setattr(stats_store, "_flush_now", asyncio.Event())
+    monkeypatch.setattr(stats_store, "_flush_task", None)
+
+def test_change_during_flush_is_written(monkeypatch):
+    _fresh_flusher(monkeypatch, 0.05)
+    writing = threading.Event()
+    release = threading.Event()
+    write = stats_store._write_snapshot
+
+    def slow_write(payload):
+        writing.set()
+        release.wait(2)
+        write(payload)
+
+    monkeypatch.setattr(stats_store, "_write_snapshot", slow_write)
+    user_id = 424242
+
+    async def main():
+        await stats_store.bump_repetition(user_id, "en", 5, 0, 0, "")
+        await asyncio.to_thread(writing.wait, 2)  # the first flush is writing now
+        await stats_store.bump_repetition(user_id, "en", 5, 1, 0, "")
+        release.set()
+        for _ in range(100):
+            await asyncio.sleep(0.02)
+            if not stats_store._dirty and stats_store._flush_task.done():
+                break
+        assert not stats_store._dirty
+        with open(stats_store.stats_path(), encoding="utf-8") as f:
+            saved = json.load(f)[str(user_id)]["en"]["5"]["repetitions"]
+        assert saved == {"0-0": 1, "1-0": 1}
+
+    asyncio.run(main())
+
+def test_failed_compaction_keeps_rotated_records(monkeypatch, tmp_path):
+    _fresh_flusher(monkeypatch, 5)
+    journal_path = tmp_path / "stats.json.journal"
+    monkeypatch.setenv("STATS_FILE", str(tmp_path / "stats.json"))
+    monkeypatch.setattr(stats_store, "_journal", stats_store.StatsJournal(journal_path))
+    write = stats_store._write_snapshot
+
+    def failing_write(payload):
+        raise OSError("disk full")
+
+    user_id = 515151
+
+    async def main():
+        monkeypatch.setattr(stats_store, "_write_snapshot", failing_write)
+        await stats_store.bump_repetition(user_id, "en", 5, 0, 0, "")
+        await stats_store._compact()  # fails: the record only survives in .1
+        await stats_store.bump_repetition(user_id, "en", 5, 1, 0, "")
+        await stats_store._compact()  # fails again; must not overwrite .1
+
+        replayed = list(stats_store.StatsJournal(journal_path).replay())
+        reps = {(r[4], r[5]) for r in replayed if r[0] == "rep" and r[1] == user_id}
+        assert reps == {(0, 0), (1, 0)}
+
+        monkeypatch.setattr(stats_store, "_write_snapshot", write)
+        await stats_store._compact()
+        assert not stats_store._journal.rotated.exists()
+        with open(stats_store.stats_path(), encoding="utf-8") as f:
+            saved = json.load(f)[str(user_id)]["en"]["5"]["repetitions"]
+        assert saved == {"0-0": 1, "1-0": 1}
+        stats_store._journal.close()
+
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+import json
+
+from core import word_loader
+from core.word_store import read_store, write_store
+
+WORDS = [
+    {"theme": "apple", "translations": {"pl": {"translation": "jabłko"}}, "shortcut": "ap"},
+    {"theme": "bee", "translations": {"pl": {"translation": "pszczoła"}}},
+    {"theme": "crossbow", "translations": {"pl": {"translation": "kusza"}},
+     "multiwords": [{"multiword": "cross bow"}]},
+    {"theme": "zebra crossing", "translations": {"pl": {"translation": "przejście"}}},
+    {"theme": "żółw", "translations": {}},
+]
+
+def test_mapped_store_matches_parsed_json(tmp_path):
+    src = tmp_path / "words.json"
+    src.write_text(json.dumps(WORDS, ensure_ascii=False), encoding="utf-8")
+    lists, en_index = word_loader.load_word_lists_from_json(str(src))
+    polish, pl_index = word_loader.load_word_lists_from_json_polish(str(src))
+    fingerprint = word_loader.words_fingerprint(str(src))
+    write_store(str(tmp_path / "words.bin"), fingerprint, lists["normal"], en_index, polish, pl_index)
+
+    en, m_en_index, pl, m_pl_index = read_store(str(tmp_path / "words.bin"), fingerprint)
+    assert list(en) == list(lists["normal"])
+    assert list(pl) == list(polish)
+    for parsed, mapped in ((en_index, m_en_index), (pl_index, m_pl_index)):
+        assert len(mapped) == len(parsed)
+        for answer, ids in parsed.items():
+            assert mapped.get(answer) == ids
+        assert mapped.get("no such answer") is None
+        assert "no such answer" not in mapped
+
+    buckets = word_loader.split_by_difficulty(en)
+    assert {k: list(v) for k, v in buckets.items()} == {k: list(v) for k, v in lists.items()}
+    assert buckets["hard"][0]["id"] == lists["hard"][0]["id"]
+
+def test_stale_store_is_ignored(tmp_path):
+    src = tmp_path / "words.json"
+    src.write_text(json.dumps(WORDS), encoding="utf-8")
+    fingerprint = word_loader.words_fingerprint(str(src))
+    lists, en_index = word_loader.load_word_lists_from_json(str(src))
+    polish, pl_index = word_loader.load_word_lists_from_json_polish(str(src))
+    path = str(tmp_path / "words.bin")
+    write_store(path, fingerprint, lists["normal"], en_index, polish, pl_index)
+    assert read_store(path, (fingerprint[0] + 1, fingerprint[1])) is None
+    with open(path, "r+b") as f:
+        f.truncate(100)
+    assert read_store(path, fingerprint) is None
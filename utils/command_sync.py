@@ -0,0 +1,50 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict
+
+import discord
+from discord import app_commands
+
+# ---------- command tree fingerprint ----------
+# tree.sync is a rate-limited round trip to Discord, and re-sending an identical
+# command list changes nothing. We hash the payload sync would upload and keep the
+# last hash that was synced per (application, guild); setup_hook only syncs when
+# it differs. FORCE_COMMAND_SYNC=1 syncs regardless (e.g. after commands were
+# edited from another machine or cleared in the developer portal).
+
+SYNC_STATE_PATH = Path(os.getenv("COMMAND_SYNC_FILE", os.path.join("data", "command_sync.json"))).resolve()
+FORCE_SYNC = os.getenv("FORCE_COMMAND_SYNC", "0").strip().lower() in {"1", "true", "yes"}
+
+def fingerprint(tree: app_commands.CommandTree, guild: discord.abc.Snowflake) -> str:
+    payload = sorted((cmd.to_dict(tree) for cmd in tree.get_commands(guild=guild)), key=lambda d: d["name"])
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+def _key(application_id, guild: discord.abc.Snowflake) -> str:
+    return f"{application_id or 0}:{guild.id}"
+
+def _load() -> Dict[str, str]:
+    try:
+        with open(SYNC_STATE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def needs_sync(application_id, guild: discord.abc.Snowflake, digest: str) -> bool:
+    return FORCE_SYNC or _load().get(_key(application_id, guild)) != digest
+
+def mark_synced(application_id, guild: discord.abc.Snowflake, digest: str) -> None:
+    data = _load()
+    data[_key(application_id, guild)] = digest
+    try:
+        SYNC_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = SYNC_STATE_PATH.with_suffix(SYNC_STATE_PATH.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, SYNC_STATE_PATH)
+    except OSError as e:
+        print(f"[WARN] Could not save command sync state to {SYNC_STATE_PATH}: {e}")
@@ -0,0 +1,73 @@
+from __future__ import annotations
+import asyncio
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import discord
+
+from core.game import Guess
+
+# ---------- per-channel guess routing ----------
+# MyBot.on_message hands every user message to dispatch(), which does one dict
+# lookup by channel id and drops the message into that session's queue. Sessions
+# read from their queue with a deadline instead of each registering a
+# bot.wait_for check that discord.py would run against every message everywhere.
+
+class GuessQueue:
+    __slots__ = ("channel_id", "_queue")
+
+    def __init__(self, channel_id: int):
+        self.channel_id = channel_id
+        self._queue: asyncio.Queue[Guess] = asyncio.Queue()
+
+    def put(self, guess: Guess) -> None:
+        self._queue.put_nowait(guess)
+
+    def clear(self) -> int:
+        """Drop every queued guess (typed before the current prompt); returns how many."""
+        dropped = 0
+        while True:
+            try:
+                self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return dropped
+            dropped += 1
+
+    async def next(self, deadline: float) -> Optional[Guess]:
+        """Next guess in this channel, or None once the loop clock passes `deadline`."""
+        try:
+            return self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        remaining = deadline - asyncio.get_event_loop().time()
+        if remaining <= 0:
+            return None
+        # an explicit getter task instead of wait_for: wait_for (<=3.11) returns a
+        # guess that arrives in the same tick as a cancel and swallows the cancel
+        getter = asyncio.ensure_future(self._queue.get())
+        try:
+            done, _ = await asyncio.wait({getter}, timeout=remaining)
+        finally:
+            getter.cancel()  # no-op once it has its guess
+        return getter.result() if getter in done else None
+
+_routes: Dict[int, GuessQueue] = {}
+
+@contextmanager
+def listen(channel_id: int) -> Iterator[GuessQueue]:
+    """Route the channel's messages to a fresh queue for the duration of the block."""
+    queue = GuessQueue(channel_id)
+    _routes[channel_id] = queue
+    try:
+        yield queue
+    finally:
+        if _routes.get(channel_id) is queue:
+            del _routes[channel_id]
+
+def dispatch(message: discord.Message, content: str) -> bool:
+    """Hand a (non-bot) message to the session listening in its channel, if any."""
+    queue = _routes.get(message.channel.id)
+    if queue is None:
+        return False
+    queue.put(Guess(content, message.author.mention))
+    return True
@@ -0,0 +1,179 @@
+from __future__ import annotations
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+import discord
+
+# ---------- outbound send scheduler ----------
+# Everything a session posts goes through here instead of straight to
+# channel.send, so under load we choose what goes out first rather than
+# discord.py sleeping on whichever request hit the limit:
+#   - a token bucket per channel and one global bucket keep us under Discord's limits
+#   - each channel sends one request at a time (keeps its messages in order)
+#   - among channels that may send, the lowest priority value goes first, so
+#     hint prompts overtake progress edits and "missed words" dumps
+#   - a queued edit of a message is replaced by a newer edit of the same message
+
+PROMPT, RESULT, PROGRESS, SUMMARY = 0, 1, 2, 3
+
+CHANNEL_RATE = float(os.getenv("OUTBOX_CHANNEL_RATE", "1.0"))   # requests/s per channel (Discord: 5 per 5s)
+CHANNEL_BURST = float(os.getenv("OUTBOX_CHANNEL_BURST", "5"))
+GLOBAL_RATE = float(os.getenv("OUTBOX_GLOBAL_RATE", "40"))      # requests/s overall (Discord: 50/s)
+GLOBAL_BURST = float(os.getenv("OUTBOX_GLOBAL_BURST", "40"))
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "stamp")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.stamp = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+    def full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+class _Item:
+    __slots__ = ("action", "futures", "key")
+
+    def __init__(self, action: Callable[[], Awaitable[Any]], key: Optional[Hashable]):
+        self.action = action
+        self.futures: List[asyncio.Future] = []
+        self.key = key
+
+    def abandoned(self) -> bool:
+        # every caller was cancelled (e.g. its session was stopped)
+        return all(f.done() for f in self.futures)
+
+class _Lane:
+    __slots__ = ("heap", "bucket", "busy")
+
+    def __init__(self):
+        self.heap: List[tuple] = []  # (priority, seq, _Item)
+        self.bucket = TokenBucket(CHANNEL_RATE, CHANNEL_BURST)
+        self.busy = False
+
+_lanes: Dict[int, _Lane] = {}
+_keyed: Dict[Hashable, _Item] = {}
+_global = TokenBucket(GLOBAL_RATE, GLOBAL_BURST)
+_seq = itertools.count()
+_wakeup: Optional[asyncio.Event] = None
+_worker: Optional[asyncio.Task] = None
+
+def depth(channel_id: Optional[int] = None) -> int:
+    """Requests waiting to go out, overall or for one channel."""
+    lanes = _lanes.values() if channel_id is None else [_lanes[channel_id]] if channel_id in _lanes else []
+    return sum(1 for lane in lanes for _, _, item in lane.heap if not item.abandoned())
+
+def _submit(channel_id: int, priority: int, action: Callable[[], Awaitable[Any]],
+            key: Optional[Hashable] = None) -> asyncio.Future:
+    global _wakeup, _worker
+    loop = asyncio.get_event_loop()
+    fut = loop.create_future()
+    item = _keyed.get(key) if key is not None else None
+    if item is not None:
+        item.action = action  # newer content wins; the stale request never goes out
+    else:
+        item = _Item(action, key)
+        if key is not None:
+            _keyed[key] = item
+        lane = _lanes.get(channel_id)
+        if lane is None:
+            lane = _lanes[channel_id] = _Lane()
+        heapq.heappush(lane.heap, (priority, next(_seq), item))
+    item.futures.append(fut)
+    if _wakeup is None:
+        _wakeup = asyncio.Event()
+    _wakeup.set()
+    if _worker is None or _worker.done():
+        _worker = asyncio.create_task(_dispatch())
+    return fut
+
+def _forget(item: _Item) -> None:
+    if item.key is not None and _keyed.get(item.key) is item:
+        del _keyed[item.key]
+
+async def _perform(lane: _Lane, item: _Item) -> None:
+    try:
+        result = await item.action()
+    except Exception as e:
+        for f in item.futures:
+            if not f.done():
+                f.set_exception(e)
+    else:
+        for f in item.futures:
+            if not f.done():
+                f.set_result(result)
+    finally:
+        lane.busy = False
+        _wakeup.set()
+
+async def _dispatch() -> None:
+    while True:
+        now = time.monotonic()
+        best: Optional[_Lane] = None
+        wait: Optional[float] = None
+        pending = False
+        for cid, lane in list(_lanes.items()):
+            while lane.heap and lane.heap[0][2].abandoned():
+                _forget(heapq.heappop(lane.heap)[2])
+            if not lane.heap:
+                if not lane.busy and lane.bucket.full(now):
+                    del _lanes[cid]
+                continue
+            pending = True
+            if lane.busy:
+                continue
+            d = lane.bucket.delay(now)
+            if d > 0:
+                wait = d if wait is None else min(wait, d)
+            elif best is None or lane.heap[0][:2] < best.heap[0][:2]:
+                best = lane
+        if not pending:
+            return
+        if best is not None:
+            d = _global.delay(now)
+            if d <= 0:
+                _global.take(now)
+                best.bucket.take(now)
+                best.busy = True
+                item = heapq.heappop(best.heap)[2]
+                _forget(item)
+                asyncio.create_task(_perform(best, item))
+                continue
+            wait = d if wait is None else min(wait, d)
+        # nothing may go out yet: sleep until a bucket refills or something changes
+        _wakeup.clear()
+        try:
+            await asyncio.wait_for(_wakeup.wait(), wait)
+        except asyncio.TimeoutError:
+            pass
+
+async def send(channel: discord.abc.Messageable, content: str, priority: int = PROMPT) -> discord.Message:
+    return await _submit(channel.id, priority, lambda: channel.send(content))
+
+async def edit(message: discord.Message, content: str, priority: int = PROGRESS) -> discord.Message:
+    """Edit `message`; a still-queued edit of the same message is replaced rather than sent twice."""
+    return await _submit(message.channel.id, priority, lambda: message.edit(content=content),
+                         key=("edit", message.id))
+
+async def delete(message: discord.Message, priority: int = SUMMARY) -> None:
+    await _submit(message.channel.id, priority, message.delete)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+import asyncio
+import os
+from typing import Optional
+
+import discord
+
+from utils import outbox
+
+# Guesses landing within this many seconds of each other share one edit
+PROGRESS_DEBOUNCE = float(os.getenv("PROGRESS_DEBOUNCE", "0.75"))
+
+class ProgressBoard:
+    """
+    One message per round that is edited in place as guesses come in, instead
+    of a send per correct guess. update() only records the latest text; a
+    debounce timer pushes it, so a burst of guesses costs one API call. If the
+    edit fails (message deleted, missing permission) the board is re-sent.
+    """
+    __slots__ = ("channel", "debounce", "message", "_pending", "_timer")
+
+    def __init__(self, channel: discord.abc.Messageable, debounce: float = PROGRESS_DEBOUNCE):
+        self.channel = channel
+        self.debounce = debounce
+        self.message: Optional[discord.Message] = None
+        self._pending: Optional[str] = None
+        self._timer: Optional[asyncio.Task] = None
+
+    def update(self, text: str) -> None:
+        self._pending = text
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.debounce)
+        await self._push()
+
+    async def _push(self) -> None:
+        text, self._pending = self._pending, None
+        if text is None:
+            return
+        try:
+            if self.message is not None:
+                try:
+                    await outbox.edit(self.message, text, outbox.PROGRESS)
+                    return
+                except discord.HTTPException:
+                    self.message = None
+            self.message = await outbox.send(self.channel, text, outbox.PROGRESS)
+        except discord.HTTPException as e:
+            print(f"⚠️ Progress board update failed: {e}")  # best effort; the round goes on
+        except asyncio.CancelledError:
+            if self._pending is None:
+                self._pending = text  # interrupted by close(); it pushes the latest text itself
+            raise
+
+    def cancel(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+
+    async def close(self) -> None:
+        """Push whatever is still pending right away; the board is final after this."""
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+            await asyncio.wait({self._timer})
+        await self._push()
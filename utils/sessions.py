@@ -0,0 +1,185 @@
+from __future__ import annotations
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import discord
+
+from utils import outbox
+from utils.guess_router import GuessQueue, listen
+from utils.progress_board import ProgressBoard
+from core.game import Answers, Attempt, Mode, Round, record_round, SOLVED, MISSED, RETRY, END
+from core.hint_utils import display_hint
+
+# ---------- session engine ----------
+# Runs core.game Modes in Discord channels: prompts and results go out through
+# the outbox, guesses come in through guess_router, and progress is edited into
+# one board message per round.
+
+RETRY_DELAY = 10  # seconds the missed words stay up before the hint is retried
+BOARD_LINES = 10  # latest guesses kept on the progress board
+STOP_WAIT = 5.0   # seconds stop_session waits for a session to unwind
+STOP_RETRY = 0.25  # seconds between repeated cancels while it does
+
+def _board_text(lines: List[str], answers: Answers) -> str:
+    parts = []
+    if len(lines) > BOARD_LINES:
+        parts.append(f"… {len(lines) - BOARD_LINES} earlier")
+    parts.extend(lines[-BOARD_LINES:])
+    if answers.total > 1:
+        parts.append(f"Progress: {answers.solved}/{answers.total}")
+    return "\n".join(parts)
+
+async def _collect(channel: discord.abc.Messageable, guesses: GuessQueue, rnd: Round, prompts: List[str],
+                   answers: Answers, board: ProgressBoard, attempt: Attempt) -> str:
+    loop = asyncio.get_event_loop()
+    lines: List[str] = []
+    started: Optional[float] = None
+    try:
+        for prompt in prompts:
+            await outbox.send(channel, prompt, outbox.PROMPT)
+            now = loop.time()
+            if started is None:
+                started = now  # once players can see the hint, not when it was queued
+                # guesses typed before this attempt's hint was up (during the retry
+                # pause, or late ones for the previous round) don't count
+                guesses.clear()
+            deadline = now + rnd.timeout
+            while not answers.done():
+                guess = await guesses.next(deadline)
+                if guess is None:
+                    break
+                if attempt.first_guess is None:
+                    attempt.first_guess = loop.time() - started
+                text = answers.credit(guess)
+                if text is None:
+                    attempt.wrong += 1
+                    continue
+                lines.append(text)
+                board.update(_board_text(lines, answers))
+            if answers.done():
+                return SOLVED
+        return MISSED
+    finally:
+        if started is not None:
+            attempt.elapsed = loop.time() - started
+
+async def _attempt(channel: discord.abc.Messageable, guesses: GuessQueue,
+                   rnd: Round, prompts: List[str], answers: Answers) -> Attempt:
+    attempt = Attempt()
+    attempt.limit = rnd.timeout * len(prompts)
+    # correct guesses edit one progress message instead of each sending their own
+    board = ProgressBoard(channel)
+    try:
+        attempt.outcome = await _collect(channel, guesses, rnd, prompts, answers, board, attempt)
+        attempt.solved, attempt.total = answers.solved, answers.total
+        await board.close()
+        return attempt
+    finally:
+        board.cancel()
+
+async def _play(channel: discord.abc.Messageable, guesses: GuessQueue, mode: Mode,
+                rnd: Round, owner_id: int) -> str:
+    prompts = rnd.prompts
+    while True:
+        answers = mode.answers(rnd.target)
+        attempt = await _attempt(channel, guesses, rnd, prompts, answers)
+        outcome = attempt.outcome
+        record_round(owner_id, rnd, attempt)
+        if outcome == SOLVED:
+            if mode.solved_text:
+                await outbox.send(channel, mode.solved_text, outbox.RESULT)
+            await mode.scoring.solved(rnd, attempt)
+        else:
+            missed_msg = await outbox.send(channel, answers.miss_text(), outbox.SUMMARY)
+            await mode.scoring.missed(rnd, attempt)
+        if rnd.footer:
+            await outbox.send(channel, rnd.footer, outbox.SUMMARY)
+        if outcome == SOLVED or mode.on_miss != RETRY:
+            return outcome
+
+        await asyncio.sleep(RETRY_DELAY)
+        await outbox.delete(missed_msg)
+        prompts = [f"🔁 Let's retry the same hint:\n```{display_hint(rnd.raw_hint)}```"]
+
+async def _run(channel: discord.abc.Messageable, mode: Mode, session: Session) -> None:
+    try:
+        with listen(channel.id) as guesses:
+            await mode.scoring.start()
+            if mode.intro:
+                await outbox.send(channel, mode.intro, outbox.PROMPT)
+            ended = False
+            for rnd in mode.rounds:
+                if session.stopped:
+                    return
+                session.hint = rnd.raw_hint
+                if await _play(channel, guesses, mode, rnd, session.owner_id) == MISSED and mode.on_miss == END:
+                    ended = True
+                    break
+            await outbox.send(channel, "🏁 Session over." if ended else mode.done_text, outbox.SUMMARY)
+    except Exception as e:
+        print(f"❗ Error in {mode.name} session: {e}")
+        await outbox.send(channel, "⚠️ Something went wrong. The session has ended.", outbox.SUMMARY)
+
+# ---------- session registry ----------
+# One asyncio.Task per channel. The registry entry goes away in the task's done
+# callback, so a session can't outlive its task whether it finished, raised or
+# was cancelled by /stop or the stop word.
+
+class Session:
+    __slots__ = ("channel_id", "owner_id", "mode", "started_at", "hint", "task", "stopped")
+
+    def __init__(self, channel_id: int, owner_id: int, mode: str):
+        self.channel_id = channel_id
+        self.owner_id = owner_id
+        self.mode = mode
+        self.started_at = datetime.now(timezone.utc)
+        self.hint: Optional[str] = None  # raw hint currently being played
+        self.task: Optional[asyncio.Task] = None
+        self.stopped = False  # set by stop_session; no further rounds start
+
+_sessions: Dict[int, Session] = {}
+
+def get_session(channel_id: int) -> Optional[Session]:
+    return _sessions.get(channel_id)
+
+def list_sessions() -> List[Session]:
+    return sorted(_sessions.values(), key=lambda s: s.started_at)
+
+def _finished(session: Session, task: asyncio.Task) -> None:
+    if _sessions.get(session.channel_id) is session:
+        del _sessions[session.channel_id]
+    if not task.cancelled() and task.exception() is not None:
+        print(f"❗ {session.mode} session in {session.channel_id} died: {task.exception()}")
+
+async def start_session(channel: discord.abc.Messageable, mode: Mode, owner_id: int) -> Optional[Session]:
+    """Play `mode` in `channel` as a background task; None (after telling the channel) if one is already running."""
+    if channel.id in _sessions:
+        await outbox.send(channel, "⚠️ A session is already active in this channel.", outbox.RESULT)
+        return None
+    session = Session(channel.id, owner_id, mode.name)
+    _sessions[channel.id] = session
+    session.task = asyncio.create_task(_run(channel, mode, session), name=f"{mode.name}:{channel.id}")
+    session.task.add_done_callback(lambda task: _finished(session, task))
+    return session
+
+async def stop_session(channel_id: int) -> bool:
+    """
+    Cancel the channel's session and wait (at most STOP_WAIT seconds) until it has
+    unwound; False if nothing was running. The cancel is repeated until the task
+    is done, in case an await swallowed it.
+    """
+    session = _sessions.get(channel_id)
+    if session is None:
+        return False
+    session.stopped = True
+    loop = asyncio.get_event_loop()
+    deadline = loop.time() + STOP_WAIT
+    while not session.task.done():
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            print(f"[WARN] {session.mode} session in {channel_id} did not stop within {STOP_WAIT}s")
+            break
+        session.task.cancel()
+        await asyncio.wait({session.task}, timeout=min(STOP_RETRY, remaining))
+    return True
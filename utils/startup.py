@@ -0,0 +1,65 @@
+from __future__ import annotations
+import asyncio
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from core import hint_atlas, stats_store, telemetry
+
+# ---------- startup ----------
+# Parsing words.json and hydrating stats and telemetry are blocking and independent
+# of Discord, so MyBot.start kicks off load_data() before logging in: they run in
+# worker threads while login, extension loading, command sync and the gateway connect
+# happen on the loop. Slash commands wait on this readiness barrier (see
+# ReadyTree.interaction_check in bot.py) instead of touching half-loaded data.
+
+READY_WAIT = 2.5  # seconds an interaction may wait for the data (Discord wants an answer within 3)
+
+_ready = asyncio.Event()
+error: Optional[BaseException] = None  # why load_data() failed, if it did
+phases: Dict[str, float] = {}          # phase -> seconds, in the order they finished
+
+def mark(phase: str, since: float) -> None:
+    phases[phase] = time.perf_counter() - since
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        mark(phase, start)
+
+def _timed_call(phase: str, fn) -> None:
+    with timed(phase):
+        fn()
+
+async def load_data() -> None:
+    """Load the word lists, stats and telemetry concurrently in worker threads, then open the barrier."""
+    global error
+    try:
+        await asyncio.gather(
+            asyncio.to_thread(_timed_call, "words", hint_atlas.load),
+            asyncio.to_thread(_timed_call, "stats", stats_store.load),
+            asyncio.to_thread(_timed_call, "telemetry", telemetry.load),
+        )
+    except Exception as e:
+        error = e
+        print("❗ Loading word lists / stats / telemetry failed:")
+        traceback.print_exc()
+    finally:
+        _ready.set()
+
+async def wait_ready(timeout: Optional[float] = None) -> bool:
+    """True once the data is loaded; False on timeout or if loading failed."""
+    try:
+        await asyncio.wait_for(_ready.wait(), timeout)
+    except asyncio.TimeoutError:
+        return False
+    return error is None
+
+def report(since: float) -> str:
+    """One line with every phase, and the total since `since` (a perf_counter value)."""
+    parts = [f"{name} {secs:.2f}s" for name, secs in phases.items()]
+    return f"⏱️ Startup: {' · '.join(parts)} · total {time.perf_counter() - since:.2f}s"